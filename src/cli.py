@@ -1,103 +1,273 @@
 import os
 import json
+import atexit
+import copy
+import queue
 import tempfile
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 from pathlib import Path
-from typing import List, Set, Optional, Dict, Any
-from dotenv import load_dotenv
-from tqdm.auto import tqdm
+from typing import List, Set, Optional, Dict, Any, Tuple
 import sys
 from InquirerPy import inquirer
 from InquirerPy.base.control import Choice
 from InquirerPy.separator import Separator
-from colorama import init, Fore, Style as ColoramaStyle
 from converter import MediaConverter
 from metadata import MetadataHandler
 from profiles import FormatProfiles
 import platform
 
-# Initialize colorama
-init()
+# orjson is optional; it encodes large path lists much faster than json.
+# Its JSONDecodeError subclasses json.JSONDecodeError, so one handler covers both.
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    _loads = json.loads
 
-load_dotenv()
+# The console code page is process-wide, so it only needs setting once
+_CODEPAGE_SET = False
+
+# Windows and macOS filesystems ignore case by default, so "A.mp4" and
+# "a.mp4" are the same file there; elsewhere they are two different files
+_CASE_INSENSITIVE_FS = os.name == 'nt' or sys.platform == 'darwin'
 
 class ConverterCLI:
     SUPPORTED_EXTENSIONS = {
-        'audio': {'.mp3', '.wav', '.aac', '.m4a', '.flac', '.ogg', '.wma'},
-        'video': {'.mp4', '.mkv', '.avi', '.mov', '.webm', '.flv', '.wmv'}
+        'audio': frozenset({'.mp3', '.wav', '.aac', '.m4a', '.flac', '.ogg', '.wma'}),
+        'video': frozenset({'.mp4', '.mkv', '.avi', '.mov', '.webm', '.flv', '.wmv'})
     }
+    _ALL_EXTS = frozenset(ext for exts in SUPPORTED_EXTENSIONS.values() for ext in exts)
+    _DIR_CACHE_SIZE = 32
+    _PREFETCH_LIMIT = 32
+    _DEFAULT_MAX_JOBS = 4
+
+    # Static menu entries, built once and shared by every menu redraw
+    _MAIN_MENU_CHOICES = (
+        Choice(value="convert", name="🔄 Convert Files"),
+        Choice(value="settings", name="⚙️  Settings"),
+        Choice(value="exit", name="🚪 Exit")
+    )
+    _SETTINGS_CHOICES = (
+        Choice(value="output", name="📁 Output Directory"),
+        Choice(value="profiles", name="⚙️  Manage Profiles"),
+        Choice(value="back", name="⬅️  Back to Main Menu")
+    )
+    _PROFILE_SUBMENU_CHOICES = (
+        Choice(value="view", name="👀 View Details"),
+        Choice(value="rename", name="✏️  Rename"),
+        Choice(value="delete", name="🗑️  Delete"),
+        Choice(value="back", name="⬅️  Back")
+    )
+    _FILE_MENU_ACTIONS = (
+        Separator("Actions"),
+        Choice(value=("action", "select_dir"), name="📁 Select Directory (Add all media files)"),
+        Choice(value=("action", "confirm"), name="✅ Confirm and Continue"),
+        Choice(value=("action", "clear"), name="🗑️  Clear selection"),
+        Choice(value=("action", "cancel"), name="❌ Cancel")
+    )
+    _PROFILE_MENU_ACTIONS = (
+        Separator("Actions"),
+        Choice(value=("action", "add"), name="➕ Add New Profile"),
+        Choice(value=("action", "add_ref"), name="📄 Add Profile from Reference"),
+        Choice(value=("action", "back"), name="⬅️  Back")
+    )
+    _EXISTING_FILES_CHOICES = (
+        Choice(value="skip", name="⏭️  Skip (don't convert existing files)"),
+        Choice(value="overwrite", name="🔄 Overwrite existing files"),
+        Choice(value="rename", name="📝 Rename (add numbers to filenames)"),
+        Choice(value="cancel", name="❌ Cancel conversion")
+    )
 
     def __init__(self):
         """Initialize the CLI interface with proper encoding setup."""
+        global _CODEPAGE_SET
         # Set up proper encoding for Windows
-        if platform.system().lower() == "windows":
-            # Ensure console can handle Unicode
-            os.system("chcp 65001")
+        if platform.system().lower() == "windows" and not _CODEPAGE_SET:
+            import ctypes
+            # Ensure console can handle Unicode, without spawning chcp
+            ctypes.windll.kernel32.SetConsoleOutputCP(65001)
+            ctypes.windll.kernel32.SetConsoleCP(65001)
             sys.stdout.reconfigure(encoding='utf-8')
             sys.stderr.reconfigure(encoding='utf-8')
+            _CODEPAGE_SET = True
         
         self.profiles = FormatProfiles()
         self.converter = MediaConverter(profiles=self.profiles)
         self.metadata = MetadataHandler()
         self.temp_file = Path(tempfile.gettempdir()) / 'converter_files.json'
         self.selected_files: List[str] = []
+        self._selected_set: Set[str] = set()
         self.output_directory: Path = Path("converted_files")
+        self._selection_dirty = False
+        self._dir_cache = OrderedDict()
+        # Listings are only read and cached on the main thread; the pool just scans
+        self._prefetch: Dict[str, Future] = {}
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=4)
+        self._speed_labels: Dict[str, str] = {}
+        self._speed_choice_cache: Dict[str, List[Choice]] = {}
         self._load_selected_files()
+        atexit.register(self._flush_selected_files)
 
     def _load_selected_files(self):
         """Load previously selected files from temp storage."""
-        if self.temp_file.exists():
-            try:
-                with open(self.temp_file, 'r', encoding='utf-8') as f:
-                    self.selected_files = json.load(f)
-            except json.JSONDecodeError:
-                self.selected_files = []
+        try:
+            data = self.temp_file.read_bytes()
+            self.selected_files = _loads(data) if data else []
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            self.selected_files = []
+        self._selected_set = set(self.selected_files)
 
     def _save_selected_files(self):
         """Save selected files to temp storage."""
-        with open(self.temp_file, 'w', encoding='utf-8') as f:
-            json.dump(self.selected_files, f, ensure_ascii=False)
+        tmp_file = self.temp_file.with_suffix('.tmp')
+        tmp_file.write_bytes(_dumps(self.selected_files))
+        os.replace(tmp_file, self.temp_file)
+        self._selection_dirty = False
+
+    def _flush_selected_files(self):
+        """Save selected files only if the selection changed since the last save."""
+        if self._selection_dirty:
+            self._save_selected_files()
 
     def _clear_selected_files(self):
         """Clear the selected files list and temp storage."""
         self.selected_files = []
-        if self.temp_file.exists():
-            self.temp_file.unlink()
+        self._selected_set.clear()
+        self._selection_dirty = False
+        self.temp_file.unlink(missing_ok=True)
 
     def _is_supported_file(self, file_path: str) -> bool:
         """Check if a file has a supported extension."""
-        ext = Path(file_path).suffix.lower()
-        return any(ext in exts for exts in self.SUPPORTED_EXTENSIONS.values())
+        return os.path.splitext(file_path)[1].lower() in self._ALL_EXTS
+
+    def _scan_directory(self, directory: str) -> Tuple[List[str], List[str]]:
+        """Scan one directory level, returning (subdirectories, media files)."""
+        subdirs = []
+        media_files = []
+        # Bound once: this loop runs for every entry in the tree
+        splitext = os.path.splitext
+        exts = self._ALL_EXTS
+        try:
+            # DirEntry carries the joined path and cached d_type, so no per-file
+            # join or stat is needed (os.fwalk would add an fstatat per subdir)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file() and splitext(entry.name)[1].lower() in exts:
+                        media_files.append(entry.path)
+        except OSError:
+            # Unreadable directories are skipped, as os.walk would
+            pass
+        return subdirs, media_files
 
     def _get_files_in_directory(self, directory: str) -> List[str]:
         """Get all supported files in a directory with interactive progress bar."""
+        from tqdm import tqdm
+
         files = []
         print("\nScanning directory for media files...")
         
-        # Convert to Path object for proper Unicode handling
-        directory_path = Path(directory)
-        
-        # First, count total files for progress bar
-        total_files = sum([len(files) for _, _, files in os.walk(str(directory_path))])
+        # Directories are scanned concurrently; each worker closes its handle
+        # before returning, so open descriptors are bounded by the pool size
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        dirs_to_scan = deque([str(Path(directory))])
+        pending = set()
         
-        with tqdm(total=total_files, 
-                 desc="Scanning directory", 
+        with tqdm(desc="Scanning directory", 
                  unit="files",
-                 bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]",
+                 bar_format="{desc}: {n_fmt} files [{elapsed}, {rate_fmt}]",
                  dynamic_ncols=True,
-                 mininterval=0.1) as pbar:
-            for root, _, filenames in os.walk(str(directory_path)):
-                root_path = Path(root)
-                for filename in filenames:
-                    file_path = str(root_path / filename)
-                    if self._is_supported_file(file_path):
-                        files.append(file_path)
-                    pbar.update(1)
-                    pbar.refresh()
+                 mininterval=0.25) as pbar, \
+             ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while dirs_to_scan or pending:
+                while dirs_to_scan and len(pending) < max_workers * 2:
+                    pending.add(executor.submit(self._scan_directory, dirs_to_scan.popleft()))
+                
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, media_files = future.result()
+                    dirs_to_scan.extend(subdirs)
+                    files.extend(media_files)
+                    # The bar counts matches, not every file visited
+                    pbar.update(len(media_files))
         
+        # Completion order is nondeterministic, keep the conversion order stable
+        files.sort()
         if files:
             print(f"\nFound {len(files)} supported media files")
         return files
 
+    def _scan_listing(self, directory: str) -> tuple:
+        """Scan a directory into (mtime_ns, subdirectories, media files) of (name, path) pairs."""
+        mtime = os.stat(directory).st_mtime_ns
+
+        # DirEntry caches the file type, so sorting and filtering need no extra stat
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name.lower())
+
+        dirs = []
+        media_files = []
+        for entry in entries:
+            if entry.is_dir():
+                dirs.append((entry.name, entry.path))
+            elif entry.is_file() and self._is_supported_file(entry.name):
+                media_files.append((entry.name, entry.path))
+
+        # Tuples, since cached listings are shared between callers
+        return mtime, tuple(dirs), tuple(media_files)
+
+    def _take_prefetched(self, directory: str) -> Optional[tuple]:
+        """Return a finished prefetched listing for a directory, if there is one."""
+        future = self._prefetch.pop(directory, None)
+        if future is None:
+            return None
+        if not future.done():
+            future.cancel()
+            return None
+        try:
+            return future.result(timeout=0)
+        except OSError:
+            return None
+
+    def _prefetch_listings(self, dirs: tuple):
+        """Scan the visible subdirectories in the background while the user is choosing."""
+        wanted = [path for _, path in dirs[:self._PREFETCH_LIMIT]
+                  if path not in self._dir_cache]
+        wanted_set = set(wanted)
+        for path in [p for p in self._prefetch if p not in wanted_set]:
+            self._prefetch.pop(path).cancel()
+        for path in wanted:
+            if path not in self._prefetch:
+                self._prefetch[path] = self._prefetch_pool.submit(self._scan_listing, path)
+
+    def _cancel_prefetch(self):
+        """Drop all pending directory prefetches."""
+        for future in self._prefetch.values():
+            future.cancel()
+        self._prefetch.clear()
+
+    def _list_directory(self, directory: str) -> Tuple[tuple, tuple]:
+        """List (name, path) pairs of subdirectories and media files, cached by directory mtime."""
+        mtime = os.stat(directory).st_mtime_ns
+        listing = self._dir_cache.get(directory)
+        if listing is None or listing[0] != mtime:
+            listing = self._take_prefetched(directory)
+        if listing is None or listing[0] != mtime:
+            listing = self._scan_listing(directory)
+
+        self._dir_cache[directory] = listing
+        self._dir_cache.move_to_end(directory)
+        if len(self._dir_cache) > self._DIR_CACHE_SIZE:
+            self._dir_cache.popitem(last=False)
+        return listing[1], listing[2]
+
     def _display_directory_contents(self, current_dir: str) -> List[str]:
         """Display directory contents and return list of items."""
         items = []
@@ -114,19 +284,12 @@ class ConverterCLI:
 
         # Add directories and files
         try:
-            # Use Path.iterdir() for better Unicode support
-            entries = sorted(current_path.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower()))
-            
-            dir_choices = []
-            file_choices = []
-            
-            for entry in entries:
-                if entry.is_dir():
-                    items.append((f"📁 {entry.name}", str(entry)))
-                    dir_choices.append(Choice(value=("directory", str(entry)), name=f"📁 {entry.name}"))
-                elif entry.is_file() and self._is_supported_file(str(entry)):
-                    items.append((f"📄 {entry.name}", str(entry)))
-                    file_choices.append(Choice(value=("file", str(entry)), name=f"📄 {entry.name}"))
+            dirs, media_files = self._list_directory(str(current_path))
+
+            items.extend((f"📁 {name}", path) for name, path in dirs)
+            items.extend((f"📄 {name}", path) for name, path in media_files)
+            dir_choices = [Choice(value=("directory", path), name=f"📁 {name}") for name, path in dirs]
+            file_choices = [Choice(value=("file", path), name=f"📄 {name}") for name, path in media_files]
 
             # Combine choices with separators
             if dir_choices:
@@ -136,6 +299,8 @@ class ConverterCLI:
                 choices.append(Separator("Files"))
                 choices.extend(file_choices)
 
+            self._prefetch_listings(dirs)
+
         except Exception as e:
             print(f"\nError reading directory contents: {str(e)}")
             return [], []
@@ -143,6 +308,23 @@ class ConverterCLI:
         print(f"\nCurrent directory: {current_dir}")
         return items, choices
 
+    def _speed_label(self, speed: str) -> str:
+        """Format a speed value such as '1.5x' for display."""
+        label = self._speed_labels.get(speed)
+        if label is None:
+            label = speed if speed == "copy" else f"{speed} ({float(speed.replace('x', ''))}x speed)"
+            self._speed_labels[speed] = label
+        return label
+
+    def _speed_choices(self, schema_key: str) -> List[Choice]:
+        """Labelled choices for a speed list in the schema, built once per key."""
+        choices = self._speed_choice_cache.get(schema_key)
+        if choices is None:
+            choices = [Choice(value=s, name=self._speed_label(s))
+                       for s in self.profiles.get_schema()[schema_key]]
+            self._speed_choice_cache[schema_key] = choices
+        return choices
+
     def _select_files_menu(self) -> bool:
         """Interactive file selection menu using InquirerPy."""
         current_dir = os.getcwd()
@@ -151,13 +333,7 @@ class ConverterCLI:
             items, choices = self._display_directory_contents(current_dir)
             
             # Add action choices
-            choices.extend([
-                Separator("Actions"),
-                Choice(value=("action", "select_dir"), name="📁 Select Directory (Add all media files)"),
-                Choice(value=("action", "confirm"), name="✅ Confirm and Continue"),
-                Choice(value=("action", "clear"), name="🗑️  Clear selection"),
-                Choice(value=("action", "cancel"), name="❌ Cancel")
-            ])
+            choices.extend(self._FILE_MENU_ACTIONS)
 
             action = inquirer.select(
                 message=f"Select files to convert (Selected: {len(self.selected_files)}):",
@@ -175,10 +351,11 @@ class ConverterCLI:
             if action_type == "directory":
                 current_dir = value
             elif action_type == "file":
-                if value not in self.selected_files:
+                if value not in self._selected_set:
+                    self._selected_set.add(value)
                     self.selected_files.append(value)
                     print(f"Added: {value}")
-                    self._save_selected_files()
+                    self._selection_dirty = True
             elif action_type == "action":
                 if value == "select_dir":
                     # Allow user to select a directory to add all media files from it
@@ -189,22 +366,28 @@ class ConverterCLI:
                         files = self._get_files_in_directory(str(selected_dir))
                         if files:
                             # Add new files that aren't already selected
-                            new_files = [f for f in files if f not in self.selected_files]
+                            new_files = [f for f in files if f not in self._selected_set]
+                            self._selected_set.update(new_files)
                             self.selected_files.extend(new_files)
                             print(f"\nAdded {len(new_files)} new files from directory")
-                            self._save_selected_files()
+                            self._selection_dirty = True
                         else:
                             print("\nNo supported media files found in directory")
                 elif value == "confirm":
                     if not self.selected_files:
                         print("No files selected!")
                         continue
+                    self._cancel_prefetch()
+                    self._flush_selected_files()
                     return True
                 elif value == "clear":
                     self.selected_files = []
-                    self._save_selected_files()
+                    self._selected_set.clear()
+                    self._selection_dirty = True
                     print("Selection cleared!")
                 elif value == "cancel":
+                    self._cancel_prefetch()
+                    self._flush_selected_files()
                     return False
 
     def _settings_menu(self):
@@ -212,11 +395,7 @@ class ConverterCLI:
         while True:
             action = inquirer.select(
                 message="Settings",
-                choices=[
-                    Choice(value="output", name="📁 Output Directory"),
-                    Choice(value="profiles", name="⚙️  Manage Profiles"),
-                    Choice(value="back", name="⬅️  Back to Main Menu")
-                ],
+                choices=list(self._SETTINGS_CHOICES),
                 default=None,
                 amark="→",
                 pointer="❯"
@@ -240,16 +419,12 @@ class ConverterCLI:
             for category, profile_list in profiles.items():
                 if category != "schema":
                     choices.append(Separator(f"{category.upper()} PROFILES"))
-                    for profile in sorted(profile_list):  # Sort profiles alphabetically
-                        choices.append(Choice(value=("profile", (category, profile)), name=f"{profile}"))
+                    # Sort profiles alphabetically
+                    choices.extend([Choice(value=("profile", (category, profile)), name=profile)
+                                    for profile in sorted(profile_list)])
             
             # Add actions
-            choices.extend([
-                Separator("Actions"),
-                Choice(value=("action", "add"), name="➕ Add New Profile"),
-                Choice(value=("action", "add_ref"), name="📄 Add Profile from Reference"),
-                Choice(value=("action", "back"), name="⬅️  Back")
-            ])
+            choices.extend(self._PROFILE_MENU_ACTIONS)
 
             action = inquirer.select(
                 message="Profile Management",
@@ -281,12 +456,7 @@ class ConverterCLI:
         while True:
             action = inquirer.select(
                 message=f"Profile: {profile_name}",
-                choices=[
-                    Choice(value="view", name="👀 View Details"),
-                    Choice(value="rename", name="✏️  Rename"),
-                    Choice(value="delete", name="🗑️  Delete"),
-                    Choice(value="back", name="⬅️  Back")
-                ],
+                choices=list(self._PROFILE_SUBMENU_CHOICES),
                 default=None,
                 amark="→",
                 pointer="❯"
@@ -316,7 +486,7 @@ class ConverterCLI:
             print("\nVideo Settings:")
             for key, value in profile["video"].items():
                 if key == "speed_control":
-                    print(f"  {key}: {value}" + (f" ({float(value.replace('x', ''))}x speed)" if value != "copy" else ""))
+                    print(f"  {key}: {self._speed_label(value)}")
                 else:
                     print(f"  {key}: {value}")
         
@@ -324,7 +494,7 @@ class ConverterCLI:
             print("\nAudio Settings:")
             for key, value in profile["audio"].items():
                 if key == "audio_speed":
-                    print(f"  {key}: {value}" + (f" ({float(value.replace('x', ''))}x speed)" if value != "copy" else ""))
+                    print(f"  {key}: {self._speed_label(value)}")
                 else:
                     print(f"  {key}: {value}")
 
@@ -349,8 +519,12 @@ class ConverterCLI:
         ).execute()
 
         profile = self.profiles.get_profile(category, old_name)
-        if profile and self.profiles.add_profile(category, new_name, profile):
-            self.profiles.remove_profile(category, old_name)
+        # Add and remove are written to disk together
+        with self.profiles.batch():
+            renamed = bool(profile) and self.profiles.add_profile(category, new_name, profile)
+            if renamed:
+                self.profiles.remove_profile(category, old_name)
+        if renamed:
             print(f"\nProfile renamed from '{old_name}' to '{new_name}'!")
         else:
             print("\nFailed to rename profile!")
@@ -378,8 +552,9 @@ class ConverterCLI:
         for category, profile_list in profiles.items():
             if category != "schema":
                 choices.append(Separator(f"{category.upper()} PROFILES"))
-                for profile in sorted(profile_list):  # Sort profiles alphabetically
-                    choices.append(Choice(value=(category, profile), name=f"{profile}"))
+                # Sort profiles alphabetically
+                choices.extend([Choice(value=(category, profile), name=profile)
+                                for profile in sorted(profile_list)])
 
         if not choices:
             print("\nNo profiles available. Please create a profile first.")
@@ -410,11 +585,9 @@ class ConverterCLI:
                 choices.append(Choice(value=("up", parent_dir), name="📁 .."))
 
             # Add directories
-            for item in sorted(os.listdir(current_dir)):
-                full_path = os.path.join(current_dir, item)
-                if os.path.isdir(full_path):
-                    items.append((item, full_path))
-                    choices.append(Choice(value=("dir", full_path), name=f"📁 {item}"))
+            dirs, _ = self._list_directory(current_dir)
+            items.extend(dirs)
+            choices.extend([Choice(value=("dir", path), name=f"📁 {name}") for name, path in dirs])
             
             # Add actions
             choices.extend([
@@ -454,6 +627,7 @@ class ConverterCLI:
                 try:
                     new_dir = Path(current_dir) / new_dir_name
                     new_dir.mkdir(parents=True, exist_ok=True)
+                    self._dir_cache.pop(current_dir, None)
                     return new_dir
                 except Exception as e:
                     print(f"\nError creating directory: {str(e)}")
@@ -482,15 +656,9 @@ class ConverterCLI:
                 choices.append(Choice(value=("up", parent_dir), name="📁 .."))
 
             # Add directories and files
-            dir_choices = []
-            file_choices = []
-            
-            for item in sorted(os.listdir(current_dir)):
-                full_path = os.path.join(current_dir, item)
-                if os.path.isdir(full_path):
-                    dir_choices.append(Choice(value=("dir", full_path), name=f"📁 {item}"))
-                elif os.path.isfile(full_path) and self._is_supported_file(full_path):
-                    file_choices.append(Choice(value=("file", full_path), name=f"📄 {item}"))
+            dirs, media_files = self._list_directory(current_dir)
+            dir_choices = [Choice(value=("dir", path), name=f"📁 {name}") for name, path in dirs]
+            file_choices = [Choice(value=("file", path), name=f"📄 {name}") for name, path in media_files]
 
             # Combine choices with separators
             if dir_choices:
@@ -529,12 +697,10 @@ class ConverterCLI:
                     ).execute()
 
                     # Check if profile already exists
-                    existing_profiles = self.profiles.list_profiles()
-                    profile_exists = False
-                    for category in ["video", "audio"]:
-                        if category in existing_profiles and name in existing_profiles[category]:
-                            profile_exists = True
-                            break
+                    profile_exists = any(
+                        self.profiles.get_profile(category, name) is not None
+                        for category in ("video", "audio")
+                    )
 
                     if profile_exists:
                         # Ask user what to do
@@ -583,10 +749,13 @@ class ConverterCLI:
             validate=lambda x: len(x) > 0
         ).execute()
 
+        # The schema is invariant for the whole dialog, fetch it once
+        schema = self.profiles.get_schema()
+
         # Get container format
         container = inquirer.select(
             message="Select container format:",
-            choices=[Choice(value=c) for c in self.profiles.get_schema()['containers']]
+            choices=[Choice(value=c) for c in schema['containers']]
         ).execute()
 
         # Initialize profile
@@ -601,99 +770,96 @@ class ConverterCLI:
             print("\nVideo Settings:")
             profile["video"]["codec"] = inquirer.select(
                 message="Video codec:",
-                choices=[Choice(value=c) for c in self.profiles.get_schema()['video_codecs']]
+                choices=[Choice(value=c) for c in schema['video_codecs']]
             ).execute()
             
             profile["video"]["resolution"] = inquirer.select(
                 message="Resolution:",
-                choices=[Choice(value=r) for r in self.profiles.get_schema()['resolutions']]
+                choices=[Choice(value=r) for r in schema['resolutions']]
             ).execute()
             
             profile["video"]["bitrate"] = inquirer.select(
                 message="Video bitrate:",
-                choices=[Choice(value=b) for b in self.profiles.get_schema()['video_bitrates']]
+                choices=[Choice(value=b) for b in schema['video_bitrates']]
             ).execute()
 
             profile["video"]["fps"] = inquirer.select(
                 message="Framerate:",
-                choices=[Choice(value=f) for f in self.profiles.get_schema()['framerates']]
+                choices=[Choice(value=f) for f in schema['framerates']]
             ).execute()
 
             profile["video"]["pixel_format"] = inquirer.select(
                 message="Pixel format:",
-                choices=[Choice(value=p) for p in self.profiles.get_schema()['pixel_formats']]
+                choices=[Choice(value=p) for p in schema['pixel_formats']]
             ).execute()
 
             profile["video"]["preset"] = inquirer.select(
                 message="Encoding preset:",
-                choices=[Choice(value=p) for p in self.profiles.get_schema()['presets']]
+                choices=[Choice(value=p) for p in schema['presets']]
             ).execute()
 
             profile["video"]["tune"] = inquirer.select(
                 message="Tuning:",
-                choices=[Choice(value=t) for t in self.profiles.get_schema()['tune_options']]
+                choices=[Choice(value=t) for t in schema['tune_options']]
             ).execute()
 
             profile["video"]["speed_control"] = inquirer.select(
                 message="Video speed:",
-                choices=[Choice(value=s, name=f"{s} ({float(s.replace('x', ''))}x speed)" if s != "copy" else s) 
-                        for s in self.profiles.get_schema()['speed_controls']]
+                choices=self._speed_choices('speed_controls')
             ).execute()
             
             # Audio settings
             print("\nAudio Settings:")
             profile["audio"]["codec"] = inquirer.select(
                 message="Audio codec:",
-                choices=[Choice(value=c) for c in self.profiles.get_schema()['audio_codecs']]
+                choices=[Choice(value=c) for c in schema['audio_codecs']]
             ).execute()
             
             profile["audio"]["bitrate"] = inquirer.select(
                 message="Audio bitrate:",
-                choices=[Choice(value=b) for b in self.profiles.get_schema()['audio_bitrates']]
+                choices=[Choice(value=b) for b in schema['audio_bitrates']]
             ).execute()
             
             profile["audio"]["sample_rate"] = inquirer.select(
                 message="Sample rate:",
-                choices=[Choice(value=r) for r in self.profiles.get_schema()['sample_rates']]
+                choices=[Choice(value=r) for r in schema['sample_rates']]
             ).execute()
 
             profile["audio"]["channels"] = inquirer.select(
                 message="Audio channels:",
-                choices=[Choice(value=c) for c in self.profiles.get_schema()['channel_layouts']]
+                choices=[Choice(value=c) for c in schema['channel_layouts']]
             ).execute()
 
             profile["audio"]["audio_speed"] = inquirer.select(
                 message="Audio speed:",
-                choices=[Choice(value=s, name=f"{s} ({float(s.replace('x', ''))}x speed)" if s != "copy" else s) 
-                        for s in self.profiles.get_schema()['audio_speeds']]
+                choices=self._speed_choices('audio_speeds')
             ).execute()
             
         else:  # Audio profile
             profile["audio"] = {}
             profile["audio"]["codec"] = inquirer.select(
                 message="Audio codec:",
-                choices=[Choice(value=c) for c in self.profiles.get_schema()['audio_codecs']]
+                choices=[Choice(value=c) for c in schema['audio_codecs']]
             ).execute()
             
             profile["audio"]["bitrate"] = inquirer.select(
                 message="Audio bitrate:",
-                choices=[Choice(value=b) for b in self.profiles.get_schema()['audio_bitrates']]
+                choices=[Choice(value=b) for b in schema['audio_bitrates']]
             ).execute()
 
             profile["audio"]["sample_rate"] = inquirer.select(
                 message="Sample rate:",
-                choices=[Choice(value=r) for r in self.profiles.get_schema()['sample_rates']]
+                choices=[Choice(value=r) for r in schema['sample_rates']]
             ).execute()
 
             profile["audio"]["channels"] = inquirer.select(
                 message="Audio channels:",
-                choices=[Choice(value=c) for c in self.profiles.get_schema()['channel_layouts']]
+                choices=[Choice(value=c) for c in schema['channel_layouts']]
             ).execute()
 
             profile["audio"]["audio_speed"] = inquirer.select(
                 message="Audio speed:",
-                choices=[Choice(value=s, name=f"{s} ({float(s.replace('x', ''))}x speed)" if s != "copy" else s) 
-                        for s in self.profiles.get_schema()['audio_speeds']]
+                choices=self._speed_choices('audio_speeds')
             ).execute()
 
         # Add the profile
@@ -702,51 +868,58 @@ class ConverterCLI:
         else:
             print("\nFailed to create profile!")
 
+    def _parameter_label(self, profile: Dict, section: str, param: str) -> str:
+        """Menu label for a profile parameter and its current value."""
+        value = profile[section].get(param, "N/A")
+        if param in ("speed_control", "audio_speed"):
+            value = self._speed_label(value)
+        return f"{section.capitalize()} {param}: {value}"
+
     def _edit_profile_parameters(self, category: str, name: str, profile: Dict):
         """Edit profile parameters interactively."""
-        while True:
-            choices = []
-            
-            # Add video parameters if it's a video profile
-            if "video" in profile:
-                choices.append(Separator("Video Settings"))
-                for param in self.profiles.get_editable_parameters(category)["video"]:
-                    current_value = profile["video"].get(param, "N/A")
-                    display_value = current_value
-                    if param == "speed_control":
-                        display_value = f"{current_value} ({float(current_value.replace('x', ''))}x speed)"
-                    choices.append(Choice(
-                        value=("video", param),
-                        name=f"Video {param}: {display_value}"
-                    ))
-
-                # Add audio parameters (excluding audio_speed for video profiles)
-                choices.append(Separator("Audio Settings"))
-                for param in self.profiles.get_editable_parameters(category)["audio"]:
-                    if param != "audio_speed":  # Skip audio_speed for video profiles
-                        current_value = profile["audio"].get(param, "N/A")
-                        choices.append(Choice(
-                            value=("audio", param),
-                            name=f"Audio {param}: {current_value}"
-                        ))
-            else:
-                # Audio profile parameters
-                choices.append(Separator("Audio Settings"))
-                for param in self.profiles.get_editable_parameters(category)["audio"]:
-                    current_value = profile["audio"].get(param, "N/A")
-                    display_value = current_value
-                    if param == "audio_speed":
-                        display_value = f"{current_value} ({float(current_value.replace('x', ''))}x speed)"
-                    choices.append(Choice(
-                        value=("audio", param),
-                        name=f"Audio {param}: {display_value}"
-                    ))
+        # Both depend only on the category and schema, so look them up once per dialog
+        editable = self.profiles.get_editable_parameters(category)
+        param_options: Dict[str, List[str]] = {}
 
-            choices.extend([
-                Separator(),
-                Choice(value=("done", None), name="✅ Done editing")
-            ])
+        # Build the menu once; after an edit only the changed entry is relabelled
+        choices = []
+        choice_by_param: Dict[tuple, Choice] = {}
 
+        # Add video parameters if it's a video profile
+        if "video" in profile:
+            choices.append(Separator("Video Settings"))
+            for param in editable["video"]:
+                choice_by_param[("video", param)] = Choice(
+                    value=("video", param),
+                    name=self._parameter_label(profile, "video", param)
+                )
+                choices.append(choice_by_param[("video", param)])
+
+            # Add audio parameters (excluding audio_speed for video profiles)
+            choices.append(Separator("Audio Settings"))
+            for param in editable["audio"]:
+                if param != "audio_speed":  # Skip audio_speed for video profiles
+                    choice_by_param[("audio", param)] = Choice(
+                        value=("audio", param),
+                        name=self._parameter_label(profile, "audio", param)
+                    )
+                    choices.append(choice_by_param[("audio", param)])
+        else:
+            # Audio profile parameters
+            choices.append(Separator("Audio Settings"))
+            for param in editable["audio"]:
+                choice_by_param[("audio", param)] = Choice(
+                    value=("audio", param),
+                    name=self._parameter_label(profile, "audio", param)
+                )
+                choices.append(choice_by_param[("audio", param)])
+
+        choices.extend([
+            Separator(),
+            Choice(value=("done", None), name="✅ Done editing")
+        ])
+
+        while True:
             try:
                 section_param = inquirer.select(
                     message="Select parameter to edit:",
@@ -760,24 +933,20 @@ class ConverterCLI:
                     break
 
                 section, param = section_param
-                options = self.profiles.get_parameter_options(f"{section}.{param}")
+                parameter_path = f"{section}.{param}"
+                options = param_options.get(parameter_path)
+                if options is None:
+                    options = param_options[parameter_path] = self.profiles.get_parameter_options(parameter_path)
                 
                 if not options:
                     print(f"No options available for {section} {param}")
                     continue
 
                 # Create choices for parameter values
-                param_choices = []
-                for option in options:
-                    if param in ["speed_control"]:
-                        if option == "copy":
-                            display_name = option
-                        else:
-                            speed_value = float(option.replace('x', ''))
-                            display_name = f"{option} ({speed_value}x speed)"
-                        param_choices.append(Choice(value=option, name=display_name))
-                    else:
-                        param_choices.append(Choice(value=option))
+                if param == "speed_control":
+                    param_choices = [Choice(value=option, name=self._speed_label(option)) for option in options]
+                else:
+                    param_choices = [Choice(value=option) for option in options]
 
                 new_value = inquirer.select(
                     message=f"Select new value for {section} {param}:",
@@ -788,13 +957,17 @@ class ConverterCLI:
                     continue
 
                 # Update the profile
-                if self.profiles.edit_profile_parameter(category, name, f"{section}.{param}", new_value):
+                updates = {parameter_path: new_value}
+                # If this is a video profile and we're updating speed_control, update audio_speed
+                # too, in the same save
+                if (category == "video" and param == "speed_control"
+                        and "audio_speed" in profile.get("audio", {})):
+                    updates["audio.audio_speed"] = new_value
+                if self.profiles.edit_profile_parameters(category, name, updates):
                     print(f"\nUpdated {section} {param} to: {new_value}")
-                    # If this is a video profile and we're updating speed_control, update audio_speed too
-                    if category == "video" and param == "speed_control":
-                        self.profiles.edit_profile_parameter(category, name, "audio.audio_speed", new_value)
                     # Refresh profile data
                     profile = self.profiles.get_profile(category, name)
+                    choice_by_param[section_param].name = self._parameter_label(profile, section, param)
                 else:
                     print(f"\nFailed to update {section} {param}")
 
@@ -803,19 +976,71 @@ class ConverterCLI:
 
         print("\nProfile updated successfully!")
 
-    def _get_unique_output_path(self, base_path: Path) -> Path:
-        """Get a unique output path by adding a number if the file exists."""
-        if not base_path.exists():
-            return base_path
-            
+    def _name_key(self, name: str) -> str:
+        """File name as the filesystem compares it: lower-cased where case is ignored."""
+        return name.lower() if _CASE_INSENSITIVE_FS else name
+
+    def _snapshot_names(self, directory: Path) -> Set[str]:
+        """
+        Names of the entries in a directory, read with one scandir.
+        Names go through _name_key, so case-insensitive filesystems are never
+        treated as having a free name that actually exists.
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return {self._name_key(entry.name) for entry in entries}
+        except FileNotFoundError:
+            return set()
+
+    def _get_unique_output_path(self, base_path: Path, existing_names: Optional[Set[str]] = None) -> Path:
+        """
+        Get a unique output path by adding a number if the file exists.
+        existing_names is a snapshot of the names in the output directory
+        (see _snapshot_names); the returned name is added to it so
+        later calls in a batch don't reuse it.
+        """
+        if existing_names is None:
+            existing_names = self._snapshot_names(base_path.parent)
+
+        name = base_path.name
         # If file exists, try adding numbers until we find a unique name
         counter = 1
-        while True:
-            new_path = base_path.parent / f"{base_path.stem}{counter}{base_path.suffix}"
-            if not new_path.exists():
-                return new_path
+        while self._name_key(name) in existing_names:
+            name = f"{base_path.stem}{counter}{base_path.suffix}"
             counter += 1
 
+        existing_names.add(self._name_key(name))
+        return base_path.parent / name
+
+    def _conversion_jobs(self, file_count: int) -> int:
+        """Number of files to convert concurrently, from CONVERSION_JOBS or the CPU count."""
+        try:
+            jobs = int(os.getenv('CONVERSION_JOBS', '0'))
+        except ValueError:
+            jobs = 0
+        if jobs <= 0:
+            # ffmpeg's encoders already spread one file over several cores, so a
+            # few files at once keeps the CPU busy without oversubscribing it
+            jobs = min(self._DEFAULT_MAX_JOBS, os.cpu_count() or 1)
+        return max(1, min(jobs, file_count))
+
+    def _convert_one(self, input_path: Path, output_path: Path, profile: Dict, category: str,
+                     positions: "queue.Queue[int]"):
+        """Convert a single file on a free progress-bar line."""
+        position = positions.get()
+        try:
+            # The converter adjusts codecs/speeds on the profile it is given,
+            # so every job works on its own copy
+            return self.converter.convert_file_with_profile(
+                input_path,
+                output_path,
+                copy.deepcopy(profile),
+                category,
+                position=position
+            )
+        finally:
+            positions.put(position)
+
     def convert_files(self):
         """Select files and convert them with the selected profile."""
         # First, select files
@@ -840,29 +1065,40 @@ class ConverterCLI:
         # Check for existing files and get user preference
         existing_files = []
         output_paths = {}
+        # Parse each selected path once and reuse it for naming and conversion
+        input_paths: Dict[str, Path] = {}
+        existing_names = self._snapshot_names(self.output_directory)
+        # Names already in the output directory or planned for this batch
+        taken_names = set(existing_names)
+        planned_names: Set[str] = set()
+        output_extension = f".{profile['container']}"
+        output_directory = self.output_directory
         
         for input_file in self.selected_files:
-            input_path = Path(input_file)
-            output_extension = f".{profile['container']}"
-            output_path = self.output_directory / f"{input_path.stem}{output_extension}"
+            input_path = input_paths[input_file] = Path(input_file)
+            output_path = output_directory / (input_path.stem + output_extension)
+            name_key = self._name_key(output_path.name)
             
-            if output_path.exists():
+            if name_key in planned_names:
+                # Another selected file with the same stem (e.g. from another
+                # folder) already writes here; jobs run concurrently, so give
+                # this one its own name instead of letting both write one file
+                output_path = self._get_unique_output_path(output_path, taken_names)
+                name_key = self._name_key(output_path.name)
+            elif name_key in existing_names:
                 existing_files.append(input_file)
+            taken_names.add(name_key)
+            planned_names.add(name_key)
             output_paths[input_file] = output_path
 
         if existing_files:
-            print("\nSome files already exist in the output directory:")
-            for file in existing_files:
-                print(f"- {output_paths[file].name}")
+            # One write for the whole list instead of a print per file
+            print("\nSome files already exist in the output directory:\n"
+                  + "\n".join(f"- {output_paths[file].name}" for file in existing_files))
             
             action = inquirer.select(
                 message="How would you like to handle existing files?",
-                choices=[
-                    Choice(value="skip", name="⏭️  Skip (don't convert existing files)"),
-                    Choice(value="overwrite", name="🔄 Overwrite existing files"),
-                    Choice(value="rename", name="📝 Rename (add numbers to filenames)"),
-                    Choice(value="cancel", name="❌ Cancel conversion")
-                ],
+                choices=list(self._EXISTING_FILES_CHOICES),
                 default=None,
                 amark="→",
                 pointer="❯"
@@ -872,45 +1108,62 @@ class ConverterCLI:
                 return
             elif action == "skip":
                 # Remove existing files from the conversion list
-                self.selected_files = [f for f in self.selected_files if f not in existing_files]
+                existing_set = set(existing_files)
+                self.selected_files = [f for f in self.selected_files if f not in existing_set]
+                self._selected_set.difference_update(existing_set)
                 if not self.selected_files:
                     print("No files to convert after skipping existing ones.")
                     return
             elif action == "rename":
-                # Update output paths with unique names
+                # Update output paths with unique names, never reusing a name
+                # another file in this batch is already going to be written to
+                for input_file in existing_files:
+                    output_paths[input_file] = self._get_unique_output_path(output_paths[input_file], taken_names)
+            elif action == "overwrite":
+                # Clear the old outputs once up front; skip and rename never
+                # write over an existing file, so nothing else is unlinked
                 for input_file in existing_files:
-                    output_paths[input_file] = self._get_unique_output_path(output_paths[input_file])
-            # For overwrite, we'll just continue with the original paths
+                    output_paths[input_file].unlink(missing_ok=True)
+
+        # Convert files with interactive progress bar. Each job mostly waits on
+        # its ffmpeg subprocess, so threads are enough to run several at once.
+        from tqdm import tqdm
+        jobs = self._conversion_jobs(len(self.selected_files))
+        # One progress line per concurrent job, below the overall bar
+        positions: "queue.Queue[int]" = queue.Queue()
+        for position in range(1, jobs + 1):
+            positions.put(position)
 
-        # Convert files with interactive progress bar
         with tqdm(total=len(self.selected_files), 
                  desc="Overall Progress", 
                  unit="file",
-                 bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]",
+                 bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}{postfix}]",
                  dynamic_ncols=True,
                  position=0,
-                 leave=True) as overall_pbar:
+                 leave=True) as overall_pbar, \
+             ThreadPoolExecutor(max_workers=jobs) as executor:
             
+            futures = {}
             for input_file in self.selected_files:
+                input_path = input_paths[input_file]
+                futures[executor.submit(
+                    self._convert_one,
+                    input_path,
+                    output_paths[input_file],
+                    profile,
+                    category,
+                    positions
+                )] = input_path
+
+            for future in as_completed(futures):
+                input_path = futures[future]
                 try:
-                    input_path = Path(input_file)
-                    output_path = output_paths[input_file]
-                    
-                    # If overwriting, ensure the file is deleted first
-                    if output_path.exists():
-                        output_path.unlink()
-                    
-                    overall_pbar.set_description(f"Converting {input_path.name}")
-                    
-                    self.converter.convert_file_with_profile(
-                        input_path,
-                        output_path,
-                        profile,
-                        category
-                    )
+                    future.result()
+                    # Let update() do the redraw instead of refreshing twice
+                    overall_pbar.set_postfix_str(input_path.name, refresh=False)
                     overall_pbar.update(1)
                 except Exception as e:
-                    print(f"\nError converting {input_file}: {str(e)}")
+                    print(f"\nError converting {input_path}: {str(e)}")
                     continue
 
         print("\nConversion completed!")
@@ -923,11 +1176,7 @@ class ConverterCLI:
             while True:
                 action = inquirer.select(
                     message="Leonid's Media Converter",
-                    choices=[
-                        Choice(value="convert", name="🔄 Convert Files"),
-                        Choice(value="settings", name="⚙️  Settings"),
-                        Choice(value="exit", name="🚪 Exit")
-                    ],
+                    choices=list(self._MAIN_MENU_CHOICES),
                     default=None,
                     amark="→",
                     pointer="❯"
@@ -948,5 +1197,13 @@ class ConverterCLI:
             sys.exit(0)
 
 if __name__ == "__main__":
+    from colorama import init
+    from dotenv import load_dotenv
+
+    # Initialize colorama
+    init()
+
+    load_dotenv()
+
     cli = ConverterCLI()
     cli.main() 
\ No newline at end of file
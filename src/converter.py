@@ -1,31 +1,97 @@
 import os
 import re
+import json
 import subprocess
-import time
 import select
 import platform
 import sys
-import tempfile
+import queue
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
-from tqdm.auto import tqdm
+from typing import Optional, Dict, Any, Union, List, Tuple, Callable, Mapping
 from profiles import FormatProfiles
 
+# hh:mm:ss[.frac] as printed in ffmpeg's out_time= progress lines
+_TIME_RE = re.compile(r'(\d+):(\d+):(\d+(?:\.\d+)?)$')
+# Input duration from the banner ffmpeg prints on stderr before converting
+_DURATION_RE = re.compile(r'^\s*Duration: (\d+:\d+:\d+(?:\.\d+)?)')
+
+# ffprobe arguments for _probe, minus the input path. Only the fields
+# _get_duration falls back through, in one query
+_FFPROBE_DURATION_CMD = (
+    'ffprobe',
+    '-v', 'error',
+    '-show_entries', 'format=duration:stream=codec_type,duration,nb_frames,r_frame_rate',
+    '-print_format', 'json',
+)
+
+# Hardware H.264 encoders in order of preference, with the option that takes
+# the profile's crf value (None where the encoder has no equivalent)
+_HW_H264_ENCODERS = (
+    ('h264_nvenc', '-cq'),
+    ('h264_qsv', '-global_quality'),
+    ('h264_videotoolbox', None),
+)
+
+_STDIO_RECONFIGURED = False
+
 class MediaConverter:
-    def __init__(self, profiles: Optional[FormatProfiles] = None):
-        """Initialize the converter with optional profiles instance."""
+    def __init__(self, profiles: Optional[FormatProfiles] = None, debug: bool = False):
+        """
+        Initialize the converter with optional profiles instance.
+        debug prints each ffmpeg command before it runs.
+        """
+        global _STDIO_RECONFIGURED
+        # Ensure proper encoding for Windows, once per process
+        if platform.system().lower() == "windows" and not _STDIO_RECONFIGURED:
+            sys.stdout.reconfigure(encoding='utf-8')
+            sys.stderr.reconfigure(encoding='utf-8')
+            _STDIO_RECONFIGURED = True
+
         self.ffmpeg_path = os.getenv('FFMPEG_PATH', 'ffmpeg')
         self.profiles = profiles or FormatProfiles()
+        self.debug = debug
+        # Opt-in: an encoder compiled into ffmpeg doesn't mean the GPU is there
+        self.hwaccel = os.getenv('FFMPEG_HWACCEL', '').lower() in ('1', 'true', 'yes')
+        self._hw_encoder: Optional[Tuple[str, Optional[str]]] = None
+        self._hw_encoder_probed = False
+        # Concurrent conversions must wait for the one probe instead of skipping it
+        self._hw_encoder_lock = threading.Lock()
+        # FFmpeg doesn't appear or disappear while we run, so check it once
+        self._ffmpeg_ok: Optional[bool] = None
+        # ffprobe output keyed by (path, mtime_ns, size)
+        self._probe_cache: Dict[Tuple[str, int, int], Optional[Dict[str, Any]]] = {}
 
     def check_ffmpeg(self) -> bool:
         """Check if FFmpeg is available and working."""
-        try:
-            subprocess.run([self.ffmpeg_path, '-version'], 
-                         capture_output=True, 
-                         check=True)
-            return True
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+        if self._ffmpeg_ok is None:
+            try:
+                subprocess.run([self.ffmpeg_path, '-version'], 
+                             capture_output=True, 
+                             check=True)
+                self._ffmpeg_ok = True
+            except (subprocess.SubprocessError, FileNotFoundError):
+                self._ffmpeg_ok = False
+        return self._ffmpeg_ok
+
+    def _hw_h264_encoder(self) -> Optional[Tuple[str, Optional[str]]]:
+        """Hardware H.264 encoder offered by this ffmpeg build, probed once."""
+        if self._hw_encoder_probed:
+            return self._hw_encoder
+        with self._hw_encoder_lock:
+            if not self._hw_encoder_probed:
+                try:
+                    result = subprocess.run([self.ffmpeg_path, '-hide_banner', '-encoders'],
+                                            capture_output=True, text=True, check=True)
+                except (subprocess.SubprocessError, FileNotFoundError):
+                    result = None
+                if result is not None:
+                    # Encoder lines look like " V....D h264_nvenc  NVIDIA NVENC H.264 encoder"
+                    available = {parts[1] for parts in map(str.split, result.stdout.splitlines()) if len(parts) > 1}
+                    self._hw_encoder = next((encoder for encoder in _HW_H264_ENCODERS if encoder[0] in available), None)
+                # Only set once _hw_encoder holds the answer, so no thread reads it early
+                self._hw_encoder_probed = True
+        return self._hw_encoder
 
     def get_media_info(self, input_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
         """Get media file information using profiles' metadata extraction."""
@@ -35,56 +101,54 @@ class MediaConverter:
         """Create a new profile based on input file's properties."""
         return self.profiles.create_profile_from_reference(str(input_path), profile_name)
 
+    def _probe(self, input_file: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        """
+        Duration-related format and stream fields from ffprobe as parsed JSON.
+        Results are cached until the file's mtime or size changes.
+        """
+        try:
+            st = os.stat(input_file)
+        except OSError:
+            return None
+        key = (str(input_file), st.st_mtime_ns, st.st_size)
+        if key in self._probe_cache:
+            return self._probe_cache[key]
+
+        try:
+            result = subprocess.run((*_FFPROBE_DURATION_CMD, str(input_file)),
+                                    capture_output=True, text=True, check=True)
+            info = json.loads(result.stdout)
+        except (subprocess.SubprocessError, FileNotFoundError, ValueError):
+            info = None
+        self._probe_cache[key] = info
+        return info
+
     def _get_duration(self, input_file: str) -> Optional[float]:
         """Get media file duration using ffprobe."""
+        info = self._probe(input_file)
+        if not info:
+            return 0
+
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'error',
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1',
-                str(input_file)
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            duration_str = result.stdout.strip()
+            duration_str = info.get('format', {}).get('duration')
             
             # Handle 'N/A' or empty duration
             if not duration_str or duration_str == 'N/A':
-                # Try alternative method using streams
-                cmd = [
-                    'ffprobe',
-                    '-v', 'error',
-                    '-select_streams', 'v:0',  # Select first video stream
-                    '-show_entries', 'stream=duration',
-                    '-of', 'default=noprint_wrappers=1:nokey=1',
-                    str(input_file)
-                ]
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-                duration_str = result.stdout.strip()
+                # Try alternative method using the first video stream
+                video_stream = next((stream for stream in info.get('streams', [])
+                                     if stream.get('codec_type') == 'video'), {})
+                duration_str = video_stream.get('duration')
                 
                 # If still no duration, try with frames and frame rate
                 if not duration_str or duration_str == 'N/A':
-                    cmd = [
-                        'ffprobe',
-                        '-v', 'error',
-                        '-select_streams', 'v:0',
-                        '-count_frames',
-                        '-show_entries', 'stream=nb_frames,r_frame_rate',
-                        '-of', 'default=noprint_wrappers=1:nokey=1',
-                        str(input_file)
-                    ]
-                    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-                    lines = result.stdout.strip().split('\n')
-                    if len(lines) >= 2:
-                        nb_frames = lines[0].strip()
-                        frame_rate = lines[1].strip()
-                        
-                        if nb_frames.isdigit() and '/' in frame_rate:
-                            num, den = map(float, frame_rate.split('/'))
-                            if den != 0:  # Avoid division by zero
-                                fps = num / den
-                                if fps > 0:  # Avoid division by zero
-                                    return float(nb_frames) / fps
+                    nb_frames = str(video_stream.get('nb_frames', ''))
+                    frame_rate = video_stream.get('r_frame_rate', '')
+                    if nb_frames.isdigit() and '/' in frame_rate:
+                        num, den = map(float, frame_rate.split('/'))
+                        if den != 0:  # Avoid division by zero
+                            fps = num / den
+                            if fps > 0:  # Avoid division by zero
+                                return float(nb_frames) / fps
             
             # Try to convert the duration string to float if we got one
             if duration_str and duration_str != 'N/A':
@@ -93,32 +157,62 @@ class MediaConverter:
             # If all methods fail, return a default duration
             return 0
             
-        except (subprocess.SubprocessError, ValueError):
+        except ValueError:
             return 0
 
     def _parse_time(self, time_str: str) -> Optional[float]:
         """Parse FFmpeg time string into seconds."""
         try:
-            if ':' in time_str:
-                h, m, s = time_str.split(':')
-                return float(h) * 3600 + float(m) * 60 + float(s)
+            match = _TIME_RE.match(time_str)
+            if match:
+                h, m, s = match.groups()
+                return int(h) * 3600 + int(m) * 60 + float(s)
             return float(time_str)
         except (ValueError, TypeError):
             return None
 
+    def _pump_lines(self, pipe, on_line: Callable[[str], None],
+                    done: Optional["queue.SimpleQueue[Optional[str]]"] = None):
+        """
+        Read a pipe in large chunks until EOF, passing each complete line to on_line.
+        If done is given, None is put on it once the pipe is exhausted.
+        """
+        pending = b''
+        try:
+            for chunk in iter(lambda: pipe.read1(65536), b''):
+                lines, pending = self._split_lines(pending, chunk)
+                for line in lines:
+                    on_line(line)
+            if pending:
+                on_line(pending.decode('utf-8', errors='replace'))
+        finally:
+            if done is not None:
+                done.put(None)
+
+    def _split_lines(self, pending: bytes, chunk: bytes) -> Tuple[List[str], bytes]:
+        """
+        Split a chunk read from an ffmpeg pipe into complete decoded lines.
+        Returns the lines and the trailing partial line to prepend to the next chunk.
+        """
+        *lines, pending = (pending + chunk).split(b'\n')
+        return [line.decode('utf-8', errors='replace').rstrip('\r') for line in lines], pending
+
     def convert_file(self, 
                     input_path: Union[str, Path], 
                     output_path: Union[str, Path], 
                     profile_name: str,
                     category: Optional[str] = None) -> subprocess.CompletedProcess:
         """Convert a media file using the specified profile with interactive progress tracking."""
+        # Imported here so menus and profile editing don't pay for tqdm at startup
+        from tqdm import tqdm
+
         if not self.check_ffmpeg():
             raise RuntimeError("FFmpeg not found. Please install FFmpeg first.")
 
         # Get file duration for progress calculation
         duration = self._get_duration(input_path)
         if not duration:
-            print("Warning: Could not determine file duration. Progress may be inaccurate.")
+            tqdm.write("Warning: Could not determine file duration. Progress may be inaccurate.")
             duration = 0
 
         # If category not provided, detect from input file
@@ -128,19 +222,18 @@ class MediaConverter:
                 raise ValueError("Could not detect media type from input file")
             category = "video" if media_info.get("video") else "audio"
 
-        # Get the FFmpeg command from profiles
-        cmd = self.profiles.generate_ffmpeg_command(
+        # Get the FFmpeg arguments from profiles
+        cmd_parts = self.profiles.generate_ffmpeg_argv(
             str(input_path),
             str(output_path),
             category,
             profile_name
         )
         
-        if not cmd:
+        if not cmd_parts:
             raise ValueError(f"Profile '{profile_name}' not found in category '{category}'")
 
-        # Split the command string into list and replace ffmpeg path
-        cmd_parts = cmd.split()
+        # Replace ffmpeg path
         cmd_parts[0] = self.ffmpeg_path
         
         # Add progress monitoring parameters
@@ -164,27 +257,35 @@ class MediaConverter:
                      bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt}% [{elapsed}<{remaining}]",
                      dynamic_ncols=True,
                      position=1,
+                     mininterval=0.25,
+                     maxinterval=1.0,
                      leave=False) as pbar:
                 
                 current_time = 0
                 last_progress = 0
+                stdout_fd = process.stdout.fileno()
+                pending = b''
 
-                # Monitor progress
+                # Monitor progress, draining the pipe in large reads rather than
+                # a readline() per progress line
                 while True:
-                    line = process.stdout.readline()
-                    if not line and process.poll() is not None:
+                    chunk = os.read(stdout_fd, 65536)
+                    if not chunk:
+                        process.wait()
                         break
-                    
-                    if line.startswith('out_time='):
-                        time_str = line.split('=')[1].strip()
-                        current_time = self._parse_time(time_str) or current_time
-                        if duration > 0:
-                            progress = min(100, int(100 * current_time / duration))
-                            # Only update if progress has changed
-                            if progress > last_progress:
-                                pbar.update(progress - last_progress)
-                                last_progress = progress
-                                pbar.refresh()
+
+                    lines, pending = self._split_lines(pending, chunk)
+                    for line in lines:
+                        # -progress output is key=value; only out_time matters here
+                        key, _, time_str = line.partition('=')
+                        if key == 'out_time':
+                            current_time = self._parse_time(time_str) or current_time
+                            if duration > 0:
+                                progress = min(100, int(100 * current_time / duration))
+                                # Only update if progress has changed
+                                if progress > last_progress:
+                                    pbar.update(progress - last_progress)
+                                    last_progress = progress
 
             # Check for errors
             if process.returncode != 0:
@@ -204,23 +305,28 @@ class MediaConverter:
                                 input_path: Union[str, Path], 
                                 output_path: Union[str, Path],
                                 profile: Dict[str, Any],
-                                category: str) -> subprocess.CompletedProcess:
-        """Convert a media file using the provided profile with interactive progress tracking."""
+                                category: str,
+                                position: int = 1) -> subprocess.CompletedProcess:
+        """
+        Convert a media file using the provided profile with interactive progress tracking.
+        position is the terminal line of the file's progress bar, so concurrent
+        conversions each draw on their own line.
+        """
+        from tqdm import tqdm
+
         if not self.check_ffmpeg():
             raise RuntimeError("FFmpeg not found. Please install FFmpeg first.")
 
-        # Get file duration for progress calculation
-        duration = self._get_duration(input_path)
-        if not duration:
-            print("Warning: Could not determine file duration. Progress may be inaccurate.")
-            duration = 0
+        # The duration for the progress calculation comes from ffmpeg's own
+        # stderr banner, so no separate ffprobe runs before the conversion
+        duration = 0
 
         # Initialize filter chains
         video_filters = []
         audio_filters = []
 
         # Add video parameters
-        cmd = ['ffmpeg', '-i', str(input_path)]
+        cmd = [self.ffmpeg_path, '-i', str(input_path)]
         
         # Get the target speed from either video or audio settings
         target_speed = "1x"
@@ -237,15 +343,24 @@ class MediaConverter:
             
             # Handle video speed first
             if target_speed != "1x":
-                speed = float(target_speed.replace('x', ''))
-                video_filters.append(f'setpts={1/speed}*PTS')
+                video_filters.append(self.profiles.setpts_filter(target_speed))
                 # If codec is copy and we have speed change, switch to h264
                 if video.get("codec") == "copy":
                     video["codec"] = "libx264"
             
+            # Swap libx264 for a hardware encoder when enabled and available
+            codec = video.get("codec", "copy")
+            hw_encoder = None
+            if self.hwaccel and codec == "libx264" and video.get("allow_hwaccel", True):
+                hw_encoder = self._hw_h264_encoder()
+            if hw_encoder:
+                codec, quality_option = hw_encoder
+                # Decode on the GPU too; frames come back to system memory so filters still apply
+                cmd[1:1] = ['-hwaccel', 'auto']
+
             # Add video parameters
-            cmd.extend(['-c:v', video.get("codec", "copy")])
-            if video.get("codec") != "copy":
+            cmd.extend(['-c:v', codec])
+            if codec != "copy":
                 if video.get("bitrate") != "copy":
                     cmd.extend(['-b:v', video["bitrate"]])
                 if video.get("resolution") != "copy":
@@ -254,12 +369,17 @@ class MediaConverter:
                     cmd.extend(['-r', video["fps"]])
                 if video.get("pixel_format") != "copy":
                     cmd.extend(['-pix_fmt', video["pixel_format"]])
-                if video.get("preset") != "copy":
-                    cmd.extend(['-preset', video["preset"]])
-                if video.get("tune") != "copy":
-                    cmd.extend(['-tune', video["tune"]])
-                if video.get("crf") != "copy":
-                    cmd.extend(['-crf', video["crf"]])
+                if hw_encoder:
+                    # x264 presets and tunes don't map onto hardware encoders
+                    if video.get("crf") != "copy" and quality_option:
+                        cmd.extend([quality_option, video["crf"]])
+                else:
+                    if video.get("preset") != "copy":
+                        cmd.extend(['-preset', video["preset"]])
+                    if video.get("tune") != "copy":
+                        cmd.extend(['-tune', video["tune"]])
+                    if video.get("crf") != "copy":
+                        cmd.extend(['-crf', video["crf"]])
 
         # Handle audio parameters
         if "audio" in profile:
@@ -267,29 +387,10 @@ class MediaConverter:
             
             # Handle audio speed first
             if target_speed != "1x":
-                speed = float(target_speed.replace('x', ''))
                 # If codec is copy and we have speed change, switch to aac
                 if audio.get("codec") == "copy":
                     audio["codec"] = "aac"
-                # For speeds > 2x or < 0.5x, chain multiple atempo filters
-                if speed > 2:
-                    stages = []
-                    remaining_speed = speed
-                    while remaining_speed > 2:
-                        stages.append("atempo=2.0")
-                        remaining_speed /= 2
-                    stages.append(f"atempo={remaining_speed}")
-                    audio_filters.append(','.join(stages))
-                elif speed < 0.5:
-                    stages = []
-                    remaining_speed = speed
-                    while remaining_speed < 0.5:
-                        stages.append("atempo=0.5")
-                        remaining_speed *= 2
-                    stages.append(f"atempo={remaining_speed}")
-                    audio_filters.append(','.join(stages))
-                else:
-                    audio_filters.append(f'atempo={speed}')
+                audio_filters.append(self.profiles.atempo_filter(target_speed))
 
             # Add audio parameters
             cmd.extend(['-c:a', audio.get("codec", "copy")])
@@ -319,37 +420,44 @@ class MediaConverter:
         cmd.insert(1, '-y')
 
         try:
-            # Print the command for debugging
-            # print(f"\nExecuting FFmpeg command:\n{' '.join(cmd)}\n")
+            # Print the command for debugging, above any progress bars
+            if self.debug:
+                tqdm.write(f"\nExecuting FFmpeg command:\n{' '.join(cmd)}\n")
             
-            # Start the conversion process with shell=True on Windows
+            # Start the conversion process
             is_windows = platform.system().lower() == "windows"
             
             if is_windows:
-                # Ensure proper encoding for Windows
-                sys.stdout.reconfigure(encoding='utf-8')
-                sys.stderr.reconfigure(encoding='utf-8')
-                
-                # For Windows, use a temporary file for progress monitoring
-                progress_file = tempfile.NamedTemporaryFile(delete=False, suffix='.txt')
-                progress_path = progress_file.name
-                progress_file.close()
-                
-                # Use string command for Windows with proper quoting
-                cmd_str = ' '.join(f'"{x}"' if ' ' in str(x) or any(c in str(x) for c in '()[]{}$&^=;!\'`~') else str(x) for x in cmd)
-                # Replace pipe:1 with the temporary file path
-                cmd_str = cmd_str.replace('pipe:1', f'"{progress_path}"')
-                
+                # select() doesn't work on Windows pipes, so each pipe gets a
+                # reader thread and progress lines come back through a queue
                 process = subprocess.Popen(
-                    cmd_str,
+                    cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
-                    shell=True,
-                    universal_newlines=True,
-                    bufsize=1,
-                    encoding='utf-8',
+                    shell=False,
                     creationflags=subprocess.CREATE_NO_WINDOW
                 )
+                progress_events: "queue.SimpleQueue[Optional[Tuple[str, str]]]" = queue.SimpleQueue()
+                error_output = []
+
+                def read_progress(line: str):
+                    key, _, time_str = line.partition('=')
+                    if key == 'out_time':
+                        progress_events.put((key, time_str))
+
+                def read_errors(line: str):
+                    if line.strip():
+                        error_output.append(line.strip())
+                        match = _DURATION_RE.match(line)
+                        if match:
+                            progress_events.put(('duration', match.group(1)))
+
+                stdout_reader = threading.Thread(
+                    target=self._pump_lines, args=(process.stdout, read_progress, progress_events), daemon=True)
+                stderr_reader = threading.Thread(
+                    target=self._pump_lines, args=(process.stderr, read_errors), daemon=True)
+                stdout_reader.start()
+                stderr_reader.start()
 
                 # Initialize progress bar with enhanced format
                 with tqdm(total=100,
@@ -357,49 +465,28 @@ class MediaConverter:
                          unit="%",
                          bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt}% [{elapsed}<{remaining}]",
                          dynamic_ncols=True,
-                         position=1,
+                         position=position,
+                         mininterval=0.25,
+                         maxinterval=1.0,
                          leave=False) as pbar:
                     
                     current_time = 0
                     last_progress = 0
-                    error_output = []
-                    last_size = 0
-
-                    while process.poll() is None:
-                        # Read progress from the temporary file
-                        try:
-                            if os.path.exists(progress_path):
-                                current_size = os.path.getsize(progress_path)
-                                if current_size > last_size:
-                                    with open(progress_path, 'r', encoding='utf-8') as f:
-                                        f.seek(last_size)
-                                        for line in f:
-                                            if line.startswith('out_time='):
-                                                time_str = line.split('=')[1].strip()
-                                                current_time = self._parse_time(time_str) or current_time
-                                                if duration > 0:
-                                                    progress = min(100, int(100 * current_time / duration))
-                                                    if progress > last_progress:
-                                                        pbar.update(progress - last_progress)
-                                                        last_progress = progress
-                                                        pbar.refresh()
-                                    last_size = current_size
-                        except Exception as e:
-                            print(f"Warning: Error reading progress file: {e}")
-                        
-                        # Check stderr for errors
-                        stderr_line = process.stderr.readline()
-                        if stderr_line:
-                            error_output.append(stderr_line.strip())
-                        
-                        # Add a small sleep to prevent CPU overload
-                        time.sleep(0.1)
-
-                # Clean up the temporary file
-                try:
-                    os.unlink(progress_path)
-                except:
-                    pass
+
+                    # Block until a reader hands over an event; None means ffmpeg closed stdout
+                    for key, time_str in iter(progress_events.get, None):
+                        if key == 'duration':
+                            duration = duration or self._parse_time(time_str) or 0
+                            continue
+                        current_time = self._parse_time(time_str) or current_time
+                        if duration > 0:
+                            progress = min(100, int(100 * current_time / duration))
+                            if progress > last_progress:
+                                pbar.update(progress - last_progress)
+                                last_progress = progress
+
+                stdout_reader.join()
+                stderr_reader.join()
 
             else:
                 process = subprocess.Popen(
@@ -417,37 +504,55 @@ class MediaConverter:
                          unit="%",
                          bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt}% [{elapsed}<{remaining}]",
                          dynamic_ncols=True,
-                         position=1,
+                         position=position,
+                         mininterval=0.25,
+                         maxinterval=1.0,
                          leave=False) as pbar:
                     
                     current_time = 0
                     last_progress = 0
                     error_output = []
-
-                    while process.poll() is None:
+                    stdout_fd = process.stdout.fileno()
+                    stderr_fd = process.stderr.fileno()
+                    stdout_pending = b''
+                    stderr_pending = b''
+
+                    # Read until ffmpeg closes both pipes, so progress and errors
+                    # written just before it exits are not left unread
+                    reads = [stdout_fd, stderr_fd]
+                    while reads:
                         # Unix systems can use select
-                        reads = [process.stdout.fileno(), process.stderr.fileno()]
                         ret = select.select(reads, [], [], 1.0)
 
+                        # Drain everything that is ready in one read per pipe
+                        # instead of a readline() per line
                         for fd in ret[0]:
-                            if fd == process.stdout.fileno():
-                                stdout_line = process.stdout.readline()
-                                if stdout_line.startswith('out_time='):
-                                    time_str = stdout_line.split('=')[1].strip()
-                                    current_time = self._parse_time(time_str) or current_time
-                                    if duration > 0:
-                                        progress = min(100, int(100 * current_time / duration))
-                                        if progress > last_progress:
-                                            pbar.update(progress - last_progress)
-                                            last_progress = progress
-                                            pbar.refresh()
-                            elif fd == process.stderr.fileno():
-                                stderr_line = process.stderr.readline()
-                                if stderr_line:
-                                    error_output.append(stderr_line.strip())
-
-                        # Add a small sleep to prevent CPU overload
-                        time.sleep(0.1)
+                            chunk = os.read(fd, 65536)
+                            if not chunk:
+                                reads.remove(fd)
+                            elif fd == stdout_fd:
+                                lines, stdout_pending = self._split_lines(stdout_pending, chunk)
+                                for stdout_line in lines:
+                                    key, _, time_str = stdout_line.partition('=')
+                                    if key == 'out_time':
+                                        current_time = self._parse_time(time_str) or current_time
+                                        if duration > 0:
+                                            progress = min(100, int(100 * current_time / duration))
+                                            if progress > last_progress:
+                                                pbar.update(progress - last_progress)
+                                                last_progress = progress
+                            elif fd == stderr_fd:
+                                lines, stderr_pending = self._split_lines(stderr_pending, chunk)
+                                for stderr_line in lines:
+                                    if stderr_line.strip():
+                                        error_output.append(stderr_line.strip())
+                                        if not duration:
+                                            match = _DURATION_RE.match(stderr_line)
+                                            if match:
+                                                duration = self._parse_time(match.group(1)) or 0
+
+                    if stderr_pending.strip():
+                        error_output.append(stderr_pending.decode('utf-8', errors='replace').strip())
 
             # Get the return code
             return_code = process.wait()
@@ -509,6 +614,6 @@ class MediaConverter:
         """Get available options for a specific parameter."""
         return self.profiles.get_parameter_options(parameter)
 
-    def get_editable_parameters(self, category: str) -> Dict[str, list]:
+    def get_editable_parameters(self, category: str) -> Mapping[str, Tuple[str, ...]]:
         """Get list of editable parameters for a category."""
         return self.profiles.get_editable_parameters(category) 
\ No newline at end of file
@@ -1,30 +1,55 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+import copy
 import json
+import os
 import subprocess
 from pathlib import Path
 
+# ffprobe arguments for read_metadata, minus the input path
+_FFPROBE_CMD = (
+    'ffprobe',
+    '-v', 'quiet',
+    '-print_format', 'json',
+    '-show_format',
+    '-show_streams',
+)
+
 class MetadataHandler:
+    _CACHE_SIZE = 256
+
     def __init__(self):
-        pass
+        # ffprobe results keyed by (path, mtime_ns, size), least recently used first
+        self._cache: "OrderedDict[Tuple[str, int, int], Optional[Dict]]" = OrderedDict()
 
     def read_metadata(self, file_path: str) -> Optional[Dict]:
-        """Read metadata from a media file using FFprobe."""
+        """
+        Read metadata from a media file using FFprobe, reusing results for unchanged files.
+        Each call returns its own copy, so callers may modify it freely.
+        """
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                file_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                return json.loads(result.stdout)
+            st = os.stat(file_path)
+        except OSError:
             return None
+        key = (str(file_path), st.st_mtime_ns, st.st_size)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return copy.deepcopy(self._cache[key])
+
+        try:
+            result = subprocess.run((*_FFPROBE_CMD, str(file_path)), capture_output=True, text=True)
+            if result.returncode == 0:
+                metadata = json.loads(result.stdout)
+            else:
+                metadata = None
         except Exception:
             return None
 
+        self._cache[key] = metadata
+        if len(self._cache) > self._CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return copy.deepcopy(metadata)
+
     def write_metadata(self, file_path: str, metadata: Dict) -> bool:
         """Write metadata to a media file."""
         # TODO: Implement metadata writing
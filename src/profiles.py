@@ -1,243 +1,395 @@
+import copy
 import json
+import math
+import os
 from pathlib import Path
-from typing import Dict, Optional, List, Union, Any
+from typing import Dict, Optional, List, Union, Any, Tuple, Mapping
+from types import MappingProxyType
 import subprocess
+import shlex
 import re
 import platform
+from contextlib import contextmanager
+from functools import lru_cache
+
+# orjson is optional; it parses profiles and ffprobe output much faster than json.
+# Its JSONDecodeError subclasses json.JSONDecodeError, so one handler covers both.
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps_indented(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    def _dumps_indented(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# The only ffprobe fields profile creation reads, so ffprobe skips tags,
+# dispositions and the rest of each stream
+_FFPROBE_PROFILE_ENTRIES = (
+    'format=format_name,bit_rate'
+    ':stream=codec_type,codec_name,width,height,r_frame_rate,pix_fmt,bit_rate,sample_rate,channels'
+)
+
+# Parsed profiles per config path, with the (mtime_ns, size) they were read at,
+# so FormatProfiles instances created later skip the parse if the file is unchanged
+_PROFILE_CACHE: Dict[str, Tuple[int, int, Dict]] = {}
+
+# Written to config/profiles.json when it doesn't exist yet
+_DEFAULT_PROFILES = {
+    "audio": {
+        "mp3_high": {
+            "container": "mp3",
+            "audio": {
+                "codec": "libmp3lame",
+                "bitrate": "320k",
+                "sample_rate": "44100",
+                "channels": "2",
+                "audio_speed": "1x"
+            }
+        },
+        "aac_high": {
+            "container": "m4a",
+            "audio": {
+                "codec": "aac",
+                "bitrate": "256k",
+                "sample_rate": "48000",
+                "channels": "2",
+                "audio_speed": "1x"
+            }
+        },
+        "double_speed": {
+            "container": "mp3",
+            "audio": {
+                "codec": "libmp3lame",
+                "bitrate": "320k",
+                "sample_rate": "44100",
+                "channels": "2",
+                "audio_speed": "2x"
+            }
+        },
+        "half_speed": {
+            "container": "mp3",
+            "audio": {
+                "codec": "libmp3lame",
+                "bitrate": "320k",
+                "sample_rate": "44100",
+                "channels": "2",
+                "audio_speed": "0.5x"
+            }
+        }
+    },
+    "video": {
+        "youtube_1080p": {
+            "container": "mp4",
+            "video": {
+                "codec": "libx264",
+                "resolution": "1920x1080",
+                "bitrate": "copy",
+                "crf": "21",
+                "fps": "30",
+                "pixel_format": "yuv420p",
+                "gop": "60",
+                "preset": "slow",
+                "tune": "film",
+                "speed_control": "1x"
+            },
+            "audio": {
+                "codec": "aac",
+                "bitrate": "128k",
+                "sample_rate": "48000",
+                "channels": "2"
+            }
+        },
+        "youtube_4k": {
+            "container": "mp4",
+            "video": {
+                "codec": "libx264",
+                "resolution": "3840x2160",
+                "bitrate": "copy",
+                "crf": "18",
+                "fps": "30",
+                "pixel_format": "yuv420p",
+                "gop": "60",
+                "preset": "slow",
+                "tune": "film",
+                "speed_control": "1x"
+            },
+            "audio": {
+                "codec": "aac",
+                "bitrate": "192k",
+                "sample_rate": "48000",
+                "channels": "2",
+                "audio_speed": "1x"
+            }
+        },
+        "h264_web_optimized": {
+            "container": "mp4",
+            "video": {
+                "codec": "libx264",
+                "resolution": "1920x1080",
+                "bitrate": "2M",
+                "crf": "23",
+                "fps": "30",
+                "pixel_format": "yuv420p",
+                "gop": "60",
+                "preset": "medium",
+                "tune": "film",
+                "speed_control": "1x"
+            },
+            "audio": {
+                "codec": "aac",
+                "bitrate": "192k",
+                "sample_rate": "48000",
+                "channels": "2",
+                "audio_speed": "1x"
+            }
+        },
+        "fast_motion": {
+            "container": "mp4",
+            "video": {
+                "codec": "libx264",
+                "resolution": "1920x1080",
+                "bitrate": "2M",
+                "crf": "23",
+                "fps": "30",
+                "pixel_format": "yuv420p",
+                "gop": "60",
+                "preset": "medium",
+                "tune": "film",
+                "speed_control": "2x"
+            },
+            "audio": {
+                "codec": "aac",
+                "bitrate": "192k",
+                "sample_rate": "48000",
+                "channels": "2",
+                "audio_speed": "2x"
+            }
+        },
+        "slow_motion": {
+            "container": "mp4",
+            "video": {
+                "codec": "libx264",
+                "resolution": "1920x1080",
+                "bitrate": "2M",
+                "crf": "23",
+                "fps": "30",
+                "pixel_format": "yuv420p",
+                "gop": "60",
+                "preset": "medium",
+                "tune": "film",
+                "speed_control": "0.5x"
+            },
+            "audio": {
+                "codec": "aac",
+                "bitrate": "192k",
+                "sample_rate": "48000",
+                "channels": "2",
+                "audio_speed": "0.5x"
+            }
+        }
+    },
+    "schema": {
+        "video_codecs": ["copy", "libx264", "libx265", "libvpx-vp9", "mpeg4", "prores"],
+        "resolutions": ["copy", "3840x2160", "2560x1440", "1920x1080", "1280x720", "854x480", "640x360"],
+        "video_bitrates": ["copy", "1M", "2M", "4M", "6M", "8M", "10M", "12M", "15M", "20M"],
+        "crf_values": ["copy", "16", "17", "18", "19", "20", "21", "22", "23", "24", "25", "26", "27", "28"],
+        "framerates": ["copy", "23.976", "24", "25", "29.97", "30", "48", "50", "59.94", "60"],
+        "pixel_formats": ["copy", "yuv420p", "yuv422p", "yuv444p", "rgb24", "yuv420p10le", "yuv422p10le"],
+        "gop_sizes": ["copy", "30", "60", "120"],
+        "presets": ["ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow", "placebo"],
+        "tune_options": ["psnr", "ssim", "grain", "zerolatency", "fastdecode", "animation"],
+        "speed_controls": ["0.25x", "0.5x", "0.75x", "1x", "1.25x", "1.5x", "1.75x", "2x", "4x", "10x"],
+        "audio_codecs": ["copy", "aac", "libmp3lame", "flac", "opus", "pcm_s16le", "pcm_s24le", "vorbis"],
+        "audio_bitrates": ["copy", "96k", "128k", "160k", "192k", "224k", "256k", "320k", "384k", "448k", "512k"],
+        "sample_rates": ["copy", "22050", "32000", "44100", "48000", "88200", "96000"],
+        "channel_layouts": ["copy", "1", "2", "2.1", "3", "4", "5.0", "5.1", "6.1", "7.1"],
+        "audio_speeds": ["0.25x", "0.5x", "0.75x", "1x", "1.25x", "1.5x", "1.75x", "2x", "4x", "10x"],
+        "containers": ["mp4", "mkv", "mov", "webm", "avi", "ts", "mxf", "mp3", "m4a", "flac", "wav", "ogg"]
+    }
+}
+
+
+def _speed_value(speed: str) -> float:
+    """Numeric value of a speed such as '1.5x'."""
+    # Schema speeds all end in a single 'x'; hand-edited profiles may omit it
+    return float(speed[:-1] if speed[-1:] == 'x' else speed)
+
+def _atempo_chain(speed: float) -> str:
+    """
+    atempo filter chain for a playback speed. atempo only accepts 0.5-2.0,
+    so speeds outside that range are split into full 2.0x/0.5x stages plus
+    one stage for the remainder.
+    """
+    if speed > 2:
+        stages = math.ceil(math.log2(speed / 2))
+        return ','.join(["atempo=2.0"] * stages + [f"atempo={speed / 2 ** stages}"])
+    if speed < 0.5:
+        stages = math.ceil(math.log2(0.5 / speed))
+        return ','.join(["atempo=0.5"] * stages + [f"atempo={speed * 2 ** stages}"])
+    return f'atempo={speed}'
+
+# Speed filters for every speed the default schema offers, built once;
+# anything else is built on demand
+_ATEMPO_FILTERS = {
+    speed: _atempo_chain(_speed_value(speed))
+    for speed in _DEFAULT_PROFILES["schema"]["audio_speeds"]
+}
+_SETPTS_FILTERS = {
+    speed: f"setpts={1 / _speed_value(speed)}*PTS"
+    for speed in _DEFAULT_PROFILES["schema"]["speed_controls"]
+}
+
+@lru_cache(maxsize=128)
+def _parse_path(parameter_path: str) -> Tuple[str, str, str]:
+    """
+    Split a "section.parameter" path into (section, parameter, schema key),
+    e.g. "video.codec" -> ("video", "codec", "video_codecs").
+    """
+    section, param = parameter_path.split('.')
+    if param == "speed_control":
+        return section, param, "speed_controls"
+    if param == "audio_speed":
+        return section, param, "audio_speeds"
+    return section, param, f"{section}_{param}s"
+
+# Editable parameters per category, in menu order
+_EDITABLE_PARAMETERS = {
+    "video": MappingProxyType({
+        "video": (
+            "codec", "resolution", "bitrate", "crf", "fps",
+            "pixel_format", "gop", "preset", "tune", "speed_control"
+        ),
+        "audio": (
+            "codec", "bitrate", "sample_rate", "channels"
+        )
+    }),
+    "audio": MappingProxyType({
+        "audio": (
+            "codec", "bitrate", "sample_rate", "channels", "audio_speed"
+        )
+    }),
+}
+_NO_EDITABLE_PARAMETERS = MappingProxyType({})
 
 class FormatProfiles:
     def __init__(self, config_path: str = "config/profiles.json"):
         self.config_path = Path(config_path)
+        # While inside batch(), saves are deferred and only marked as pending
+        self._batch_depth = 0
+        self._save_pending = False
         self._load_profiles()
+        # Hashed copies of the schema's option lists for validation lookups
+        self._schema_sets: Dict[str, frozenset] = {
+            key: frozenset(options) for key, options in self.get_schema().items()
+        }
 
     def _load_profiles(self):
         """Load profiles from JSON file. Create default if doesn't exist."""
-        if not self.config_path.exists():
+        try:
+            st = self.config_path.stat()
+        except FileNotFoundError:
+            st = None
+
+        if st is None:
             # Initialize with default schema and profiles
-            self.profiles = {
-                "audio": {
-                    "mp3_high": {
-                        "container": "mp3",
-                        "audio": {
-                            "codec": "libmp3lame",
-                            "bitrate": "320k",
-                            "sample_rate": "44100",
-                            "channels": "2",
-                            "audio_speed": "1x"
-                        }
-                    },
-                    "aac_high": {
-                        "container": "m4a",
-                        "audio": {
-                            "codec": "aac",
-                            "bitrate": "256k",
-                            "sample_rate": "48000",
-                            "channels": "2",
-                            "audio_speed": "1x"
-                        }
-                    },
-                    "double_speed": {
-                        "container": "mp3",
-                        "audio": {
-                            "codec": "libmp3lame",
-                            "bitrate": "320k",
-                            "sample_rate": "44100",
-                            "channels": "2",
-                            "audio_speed": "2x"
-                        }
-                    },
-                    "half_speed": {
-                        "container": "mp3",
-                        "audio": {
-                            "codec": "libmp3lame",
-                            "bitrate": "320k",
-                            "sample_rate": "44100",
-                            "channels": "2",
-                            "audio_speed": "0.5x"
-                        }
-                    }
-                },
-                "video": {
-                    "youtube_1080p": {
-                        "container": "mp4",
-                        "video": {
-                            "codec": "libx264",
-                            "resolution": "1920x1080",
-                            "bitrate": "copy",
-                            "crf": "21",
-                            "fps": "30",
-                            "pixel_format": "yuv420p",
-                            "gop": "60",
-                            "preset": "slow",
-                            "tune": "film",
-                            "speed_control": "1x"
-                        },
-                        "audio": {
-                            "codec": "aac",
-                            "bitrate": "128k",
-                            "sample_rate": "48000",
-                            "channels": "2"
-                        }
-                    },
-                    "youtube_4k": {
-                        "container": "mp4",
-                        "video": {
-                            "codec": "libx264",
-                            "resolution": "3840x2160",
-                            "bitrate": "copy",
-                            "crf": "18",
-                            "fps": "30",
-                            "pixel_format": "yuv420p",
-                            "gop": "60",
-                            "preset": "slow",
-                            "tune": "film",
-                            "speed_control": "1x"
-                        },
-                        "audio": {
-                            "codec": "aac",
-                            "bitrate": "192k",
-                            "sample_rate": "48000",
-                            "channels": "2",
-                            "audio_speed": "1x"
-                        }
-                    },
-                    "h264_web_optimized": {
-                        "container": "mp4",
-                        "video": {
-                            "codec": "libx264",
-                            "resolution": "1920x1080",
-                            "bitrate": "2M",
-                            "crf": "23",
-                            "fps": "30",
-                            "pixel_format": "yuv420p",
-                            "gop": "60",
-                            "preset": "medium",
-                            "tune": "film",
-                            "speed_control": "1x"
-                        },
-                        "audio": {
-                            "codec": "aac",
-                            "bitrate": "192k",
-                            "sample_rate": "48000",
-                            "channels": "2",
-                            "audio_speed": "1x"
-                        }
-                    },
-                    "fast_motion": {
-                        "container": "mp4",
-                        "video": {
-                            "codec": "libx264",
-                            "resolution": "1920x1080",
-                            "bitrate": "2M",
-                            "crf": "23",
-                            "fps": "30",
-                            "pixel_format": "yuv420p",
-                            "gop": "60",
-                            "preset": "medium",
-                            "tune": "film",
-                            "speed_control": "2x"
-                        },
-                        "audio": {
-                            "codec": "aac",
-                            "bitrate": "192k",
-                            "sample_rate": "48000",
-                            "channels": "2",
-                            "audio_speed": "2x"
-                        }
-                    },
-                    "slow_motion": {
-                        "container": "mp4",
-                        "video": {
-                            "codec": "libx264",
-                            "resolution": "1920x1080",
-                            "bitrate": "2M",
-                            "crf": "23",
-                            "fps": "30",
-                            "pixel_format": "yuv420p",
-                            "gop": "60",
-                            "preset": "medium",
-                            "tune": "film",
-                            "speed_control": "0.5x"
-                        },
-                        "audio": {
-                            "codec": "aac",
-                            "bitrate": "192k",
-                            "sample_rate": "48000",
-                            "channels": "2",
-                            "audio_speed": "0.5x"
-                        }
-                    }
-                },
-                "schema": {
-                    "video_codecs": ["copy", "libx264", "libx265", "libvpx-vp9", "mpeg4", "prores"],
-                    "resolutions": ["copy", "3840x2160", "2560x1440", "1920x1080", "1280x720", "854x480", "640x360"],
-                    "video_bitrates": ["copy", "1M", "2M", "4M", "6M", "8M", "10M", "12M", "15M", "20M"],
-                    "crf_values": ["copy", "16", "17", "18", "19", "20", "21", "22", "23", "24", "25", "26", "27", "28"],
-                    "framerates": ["copy", "23.976", "24", "25", "29.97", "30", "48", "50", "59.94", "60"],
-                    "pixel_formats": ["copy", "yuv420p", "yuv422p", "yuv444p", "rgb24", "yuv420p10le", "yuv422p10le"],
-                    "gop_sizes": ["copy", "30", "60", "120"],
-                    "presets": ["ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow", "placebo"],
-                    "tune_options": ["psnr", "ssim", "grain", "zerolatency", "fastdecode", "animation"],
-                    "speed_controls": ["0.25x", "0.5x", "0.75x", "1x", "1.25x", "1.5x", "1.75x", "2x", "4x", "10x"],
-                    "audio_codecs": ["copy", "aac", "libmp3lame", "flac", "opus", "pcm_s16le", "pcm_s24le", "vorbis"],
-                    "audio_bitrates": ["copy", "96k", "128k", "160k", "192k", "224k", "256k", "320k", "384k", "448k", "512k"],
-                    "sample_rates": ["copy", "22050", "32000", "44100", "48000", "88200", "96000"],
-                    "channel_layouts": ["copy", "1", "2", "2.1", "3", "4", "5.0", "5.1", "6.1", "7.1"],
-                    "audio_speeds": ["0.25x", "0.5x", "0.75x", "1x", "1.25x", "1.5x", "1.75x", "2x", "4x", "10x"],
-                    "containers": ["mp4", "mkv", "mov", "webm", "avi", "ts", "mxf", "mp3", "m4a", "flac", "wav", "ogg"]
-                }
-            }
+            self.profiles = copy.deepcopy(_DEFAULT_PROFILES)
             self._save_profiles()
         else:
+            cache_key = str(self.config_path)
+            cached = _PROFILE_CACHE.get(cache_key)
+            if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+                self.profiles = copy.deepcopy(cached[2])
+                return
+
             try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self.profiles = json.load(f)
+                self.profiles = _loads(self.config_path.read_bytes())
                     
                 # Update existing profiles to match new schema
+                changed = False
                 for category, profiles in self.profiles.items():
                     if category == "schema":
                         continue
                         
-                    for profile_name, profile in profiles.items():
+                    for profile in profiles.values():
+                        video = profile.get("video")
+                        audio = profile.get("audio")
                         if category == "video":
                             # Ensure video profile has speed_control
-                            if "video" in profile:
-                                if "speed_control" not in profile["video"]:
+                            if video is not None:
+                                speed = video.get("speed_control")
+                                if speed is None:
                                     # If audio_speed exists, use that value, otherwise default to "1x"
-                                    speed = profile.get("audio", {}).get("audio_speed", "1x")
-                                    profile["video"]["speed_control"] = speed
+                                    speed = video["speed_control"] = (audio or {}).get("audio_speed", "1x")
+                                    changed = True
                                 
                                 # Remove audio_speed from audio settings in video profiles
-                                if "audio" in profile and "audio_speed" in profile["audio"]:
-                                    profile["audio"]["audio_speed"] = profile["video"]["speed_control"]
+                                if audio is not None and audio.get("audio_speed", speed) != speed:
+                                    audio["audio_speed"] = speed
+                                    changed = True
                         
                         elif category == "audio":
                             # Ensure audio profile has audio_speed
-                            if "audio" in profile and "audio_speed" not in profile["audio"]:
-                                profile["audio"]["audio_speed"] = "1x"
+                            if audio is not None and "audio_speed" not in audio:
+                                audio["audio_speed"] = "1x"
+                                changed = True
                 
-                # Save the updated profiles
-                self._save_profiles()
+                # Save the updated profiles, only if the migration touched them
+                if changed:
+                    self._save_profiles()
+                    st = self.config_path.stat()
+                _PROFILE_CACHE[cache_key] = (st.st_mtime_ns, st.st_size, copy.deepcopy(self.profiles))
                 
             except (json.JSONDecodeError, FileNotFoundError):
                 print(f"Error loading profiles from {self.config_path}, creating new file")
-                self._load_profiles()  # Recursively call to create new file
+                # Reset directly; reloading would hit the same unreadable file again.
+                # Keep the old file next to the new one in case it can be repaired
+                backup_path = self.config_path.with_suffix(self.config_path.suffix + ".bak")
+                try:
+                    self.config_path.replace(backup_path)
+                except FileNotFoundError:
+                    pass
+                self.profiles = copy.deepcopy(_DEFAULT_PROFILES)
+                self._save_profiles()
 
     def _save_profiles(self):
         """Save profiles to JSON file."""
+        if self._batch_depth:
+            self._save_pending = True
+            return
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_path, 'w', encoding='utf-8') as f:
+        # Write a sibling file and swap it in, so readers never see a half-written file
+        tmp_path = self.config_path.with_suffix(self.config_path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(self.profiles, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.config_path)
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several profile changes into a single save.
+        Changes made inside the block are written once when it exits.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._save_pending:
+                self._save_pending = False
+                self._save_profiles()
 
     def _validate_profile(self, category: str, settings: Dict) -> bool:
         """Validate profile settings against schema."""
-        schema = self.profiles.get("schema", {})
-        if not schema:
+        schema_sets = self._schema_sets
+        if not schema_sets:
             return True  # Skip validation if schema is not defined
 
         # Validate container format first
-        if settings.get("container") not in schema.get("containers", []):
-            print(f"Invalid container format: {settings.get('container')}")
+        container = settings.get("container")
+        if container not in schema_sets.get("containers", ()):
+            print(f"Invalid container format: {container}")
             return False
 
         if category == "video":
@@ -246,7 +398,7 @@ class FormatProfiles:
             
             # Get speed from video settings
             speed_control = video_settings.get("speed_control", "1x")
-            if speed_control not in schema.get("speed_controls", []):
+            if speed_control not in schema_sets.get("speed_controls", ()):
                 print(f"Invalid speed control: {speed_control}")
                 return False
             
@@ -259,7 +411,7 @@ class FormatProfiles:
                 if param == "speed_control":
                     continue  # Already validated
                 param_type = f"video_{param}s"
-                if param_type in schema and value != "copy" and value not in schema[param_type]:
+                if param_type in schema_sets and value != "copy" and value not in schema_sets[param_type]:
                     print(f"Invalid video {param}: {value}")
                     return False
 
@@ -268,7 +420,7 @@ class FormatProfiles:
                 if param == "audio_speed":
                     continue  # Skip as it's synchronized with video speed
                 param_type = f"audio_{param}s" if param != "codec" else "audio_codecs"
-                if param_type in schema and value != "copy" and value not in schema[param_type]:
+                if param_type in schema_sets and value != "copy" and value not in schema_sets[param_type]:
                     print(f"Invalid audio {param}: {value}")
                     return False
 
@@ -278,7 +430,7 @@ class FormatProfiles:
             # Validate audio settings
             for param, value in audio_settings.items():
                 param_type = f"audio_{param}s" if param != "codec" else "audio_codecs"
-                if param_type in schema and value != "copy" and value not in schema[param_type]:
+                if param_type in schema_sets and value != "copy" and value not in schema_sets[param_type]:
                     print(f"Invalid audio {param}: {value}")
                     return False
 
@@ -332,11 +484,10 @@ class FormatProfiles:
     def import_profile(self, profile_path: str) -> Optional[Dict]:
         """Import a profile from a JSON file."""
         try:
-            with open(profile_path, 'r') as f:
-                new_profile = json.load(f)
-                if not isinstance(new_profile, dict):
-                    return None
-                return new_profile
+            new_profile = _loads(Path(profile_path).read_bytes())
+            if not isinstance(new_profile, dict):
+                return None
+            return new_profile
         except (json.JSONDecodeError, FileNotFoundError):
             return None
 
@@ -347,12 +498,27 @@ class FormatProfiles:
             return False
         
         try:
-            with open(export_path, 'w') as f:
-                json.dump(profile, f, indent=4)
+            with open(export_path, 'wb') as f:
+                f.write(_dumps_indented(profile))
             return True
-        except:
+        except (OSError, TypeError, ValueError) as e:
+            # orjson.JSONEncodeError is a TypeError
+            print(f"Error exporting profile: {str(e)}")
             return False
 
+    def _first_streams(self, streams: List[Dict]) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """First video and first audio stream from ffprobe output, found in one pass."""
+        video_stream = audio_stream = None
+        for stream in streams:
+            codec_type = stream.get('codec_type')
+            if codec_type == 'video' and video_stream is None:
+                video_stream = stream
+            elif codec_type == 'audio' and audio_stream is None:
+                audio_stream = stream
+            if video_stream is not None and audio_stream is not None:
+                break
+        return video_stream, audio_stream
+
     def create_profile_from_reference(self, file_path: str, profile_name: str) -> Optional[Dict[str, Any]]:
         """
         Create a new profile from a reference file.
@@ -370,8 +536,7 @@ class FormatProfiles:
                     'ffprobe',
                     '-v', 'quiet',
                     '-print_format', 'json',
-                    '-show_format',
-                    '-show_streams',
+                    '-show_entries', _FFPROBE_PROFILE_ENTRIES,
                     file_path
                 ]
                 # Use string command for Windows
@@ -389,8 +554,7 @@ class FormatProfiles:
                     'ffprobe',
                     '-v', 'quiet',
                     '-print_format', 'json',
-                    '-show_format',
-                    '-show_streams',
+                    '-show_entries', _FFPROBE_PROFILE_ENTRIES,
                     file_path
                 ]
                 result = subprocess.run(
@@ -405,7 +569,7 @@ class FormatProfiles:
                 return None
                 
             try:
-                metadata = json.loads(result.stdout)
+                metadata = _loads(result.stdout)
             except json.JSONDecodeError:
                 print("Error: Invalid JSON output from ffprobe")
                 return None
@@ -415,13 +579,13 @@ class FormatProfiles:
                 return None
 
             # Determine category based on streams present
-            has_video = any(s.get('codec_type') == 'video' for s in metadata['streams'])
-            category = "video" if has_video else "audio"
+            video_stream, audio_stream = self._first_streams(metadata['streams'])
+            category = "video" if video_stream is not None else "audio"
             
             # Get container format
             container = metadata['format']['format_name'].split(',')[0].lower()
             # If container not in supported list, default to mp4/m4a
-            if container not in self.get_schema()['containers']:
+            if container not in self._schema_sets['containers']:
                 container = 'mp4' if category == "video" else 'm4a'
             
             # Create profile structure
@@ -429,7 +593,6 @@ class FormatProfiles:
             
             # Add video settings if it's a video file
             if category == "video":
-                video_stream = next((s for s in metadata['streams'] if s['codec_type'] == 'video'), None)
                 if video_stream:
                     profile["video"] = {
                         "codec": "libx264",  # Default to h264 for compatibility
@@ -445,7 +608,6 @@ class FormatProfiles:
                     }
 
             # Add audio settings
-            audio_stream = next((s for s in metadata['streams'] if s['codec_type'] == 'audio'), None)
             if audio_stream:
                 profile["audio"] = {
                     "codec": "aac" if category == "video" else "libmp3lame",  # Default to AAC for video, MP3 for audio
@@ -477,6 +639,16 @@ class FormatProfiles:
         parameter_path format: "section.parameter" (e.g., "video.codec" or "audio.bitrate")
         Returns True if successful, False otherwise.
         """
+        return self.edit_profile_parameters(category, profile_name, {parameter_path: new_value})
+
+    def edit_profile_parameters(self, category: str, profile_name: str,
+                              updates: Dict[str, str]) -> bool:
+        """
+        Edit several parameters of a profile and save them in one write.
+        updates maps parameter paths ("section.parameter") to new values.
+        Nothing is changed unless every update is valid.
+        Returns True if successful, False otherwise.
+        """
         if category not in self.profiles:
             return False
 
@@ -484,28 +656,25 @@ class FormatProfiles:
         if not profile:
             return False
 
-        # Split the parameter path
-        section, param = parameter_path.split('.')
-        if section not in profile or param not in profile[section]:
-            return False
-
-        # Validate the new value against schema
-        schema = self.get_schema()
-        param_type = f"{section}_{param}s"  # e.g., video_codecs, audio_bitrates
-        
-        if param_type in schema:
-            if new_value != "copy" and new_value not in schema[param_type]:
+        schema_sets = self._schema_sets
+        parsed = []
+        for parameter_path, new_value in updates.items():
+            # Split the parameter path
+            section, param, param_type = _parse_path(parameter_path)
+            if section not in profile or param not in profile[section]:
                 return False
+
+            # Validate the new value against schema
+            if param_type in schema_sets:
+                if new_value != "copy" and new_value not in schema_sets[param_type]:
+                    return False
+            parsed.append((section, param, new_value))
         
-        # Create a copy of the profile to modify
-        updated_profile = dict(profile)
-        updated_profile[section] = dict(profile[section])
-        
-        # Update the parameter
-        updated_profile[section][param] = new_value
+        # Every update was validated above, so apply them in place
+        for section, param, new_value in parsed:
+            profile[section][param] = new_value
         
         # Save the updated profile
-        self.profiles[category][profile_name] = updated_profile
         self._save_profiles()
         
         return True
@@ -515,61 +684,34 @@ class FormatProfiles:
         Get available options for a specific parameter from the schema.
         parameter_path format: "section.parameter" (e.g., "video.codec" or "audio.bitrate")
         """
-        schema = self.get_schema()
-        section, param = parameter_path.split('.')
-        
-        # Special handling for speed parameters
-        if param == "speed_control":
-            return schema.get("speed_controls", [])
-        elif param == "audio_speed":
-            return schema.get("audio_speeds", [])
-            
-        # For other parameters
-        param_type = f"{section}_{param}s"
-        return schema.get(param_type, [])
+        _, _, param_type = _parse_path(parameter_path)
+        return self.get_schema().get(param_type, [])
 
-    def get_editable_parameters(self, category: str) -> Dict[str, List[str]]:
+    def get_editable_parameters(self, category: str) -> Mapping[str, Tuple[str, ...]]:
         """
         Get a list of all editable parameters for a category (video or audio).
-        Returns a dictionary of sections with their parameters.
+        Returns a read-only mapping of sections to their parameters.
         """
-        if category == "video":
-            return {
-                "video": [
-                    "codec", "resolution", "bitrate", "crf", "fps",
-                    "pixel_format", "gop", "preset", "tune", "speed_control"
-                ],
-                "audio": [
-                    "codec", "bitrate", "sample_rate", "channels"
-                ]
-            }
-        elif category == "audio":
-            return {
-                "audio": [
-                    "codec", "bitrate", "sample_rate", "channels", "audio_speed"
-                ]
-            }
-        return {}
+        return _EDITABLE_PARAMETERS.get(category, _NO_EDITABLE_PARAMETERS)
 
     def extract_metadata(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Extract metadata from a media file using FFmpeg."""
         try:
             cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', 
-                  '-show_format', '-show_streams', file_path]
+                  '-show_entries', _FFPROBE_PROFILE_ENTRIES, file_path]
             result = subprocess.run(cmd, capture_output=True, text=True)
             
             if result.returncode != 0:
                 return None
                 
-            metadata = json.loads(result.stdout)
+            metadata = _loads(result.stdout)
             
             # Extract relevant information
-            video_stream = next((s for s in metadata['streams'] if s['codec_type'] == 'video'), None)
-            audio_stream = next((s for s in metadata['streams'] if s['codec_type'] == 'audio'), None)
+            video_stream, audio_stream = self._first_streams(metadata['streams'])
             
             # Get container format
             container = metadata['format']['format_name'].split(',')[0]
-            if container not in self.get_schema()['containers']:
+            if container not in self._schema_sets['containers']:
                 container = 'mp4'  # Default to mp4 if container not supported
             
             profile = {
@@ -607,9 +749,34 @@ class FormatProfiles:
             print(f"Error extracting metadata: {str(e)}")
             return None
 
+    def atempo_filter(self, speed: str) -> str:
+        """Audio filter for a speed value such as '1.5x'."""
+        speed_filter = _ATEMPO_FILTERS.get(speed)
+        if speed_filter is None:
+            speed_filter = _atempo_chain(_speed_value(speed))
+        return speed_filter
+
+    def setpts_filter(self, speed: str) -> str:
+        """Video filter for a speed value such as '1.5x'."""
+        speed_filter = _SETPTS_FILTERS.get(speed)
+        if speed_filter is None:
+            speed_filter = f"setpts={1 / _speed_value(speed)}*PTS"
+        return speed_filter
+
     def generate_ffmpeg_command(self, input_file: str, output_file: str, 
                               category: str, profile_name: str) -> Optional[str]:
-        """Generate FFmpeg command from profile settings."""
+        """Generate FFmpeg command from profile settings, as a single quoted string for display."""
+        cmd = self.generate_ffmpeg_argv(input_file, output_file, category, profile_name)
+        if cmd is None:
+            return None
+        if platform.system().lower() == "windows":
+            # Use list2cmdline for proper escaping
+            return subprocess.list2cmdline(cmd)
+        return shlex.join(cmd)
+
+    def generate_ffmpeg_argv(self, input_file: str, output_file: str,
+                           category: str, profile_name: str) -> Optional[List[str]]:
+        """Generate the FFmpeg argument list from profile settings, ready to pass to subprocess."""
         profile = self.get_profile(category, profile_name)
         if not profile:
             return None
@@ -618,157 +785,57 @@ class FormatProfiles:
         input_file = str(Path(input_file))
         output_file = str(Path(output_file))
         
-        is_windows = platform.system().lower() == "windows"
-        if is_windows:
-            # Use subprocess.list2cmdline for proper Windows command escaping
-            cmd = ['ffmpeg']
-            cmd.extend(['-i', input_file])
-            
-            # Track if we need to combine filters
-            video_filters = []
-            audio_filters = []
-            
-            # Add video parameters
-            if category == "video" and "video" in profile:
-                video = profile["video"]
-                if video.get("codec") != "copy":
-                    cmd.extend(['-c:v', video["codec"]])
-                    if video.get("bitrate") != "copy":
-                        cmd.extend(['-b:v', video["bitrate"]])
-                    if video.get("resolution") != "copy":
-                        cmd.extend(['-s', video["resolution"]])
-                    if video.get("fps") != "copy":
-                        cmd.extend(['-r', video["fps"]])
-                    if video.get("pixel_format") != "copy":
-                        cmd.extend(['-pix_fmt', video["pixel_format"]])
-                    if video.get("preset") != "copy":
-                        cmd.extend(['-preset', video["preset"]])
-                    if video.get("tune") != "copy":
-                        cmd.extend(['-tune', video["tune"]])
-                    if video.get("speed_control", "1x") != "1x":
-                        speed = float(video["speed_control"].replace('x', ''))
-                        video_filters.append(f'setpts={1/speed}*PTS')
-                else:
-                    cmd.extend(['-c:v', 'copy'])
-
-            # Add audio parameters
-            if "audio" in profile:
-                audio = profile["audio"]
-                if audio.get("codec") != "copy":
-                    cmd.extend(['-c:a', audio["codec"]])
-                    if audio.get("bitrate") != "copy":
-                        cmd.extend(['-b:a', audio["bitrate"]])
-                    if audio.get("sample_rate") != "copy":
-                        cmd.extend(['-ar', audio["sample_rate"]])
-                    if audio.get("channels") != "copy":
-                        cmd.extend(['-ac', audio["channels"]])
-                    if audio.get("audio_speed", "1x") != "1x":
-                        speed = float(audio["audio_speed"].replace('x', ''))
-                        # For speeds > 2x or < 0.5x, we need to chain multiple atempo filters
-                        if speed > 2:
-                            stages = []
-                            remaining_speed = speed
-                            while remaining_speed > 2:
-                                stages.append("atempo=2.0")
-                                remaining_speed /= 2
-                            stages.append(f"atempo={remaining_speed}")
-                            audio_filters.append(','.join(stages))
-                        elif speed < 0.5:
-                            stages = []
-                            remaining_speed = speed
-                            while remaining_speed < 0.5:
-                                stages.append("atempo=0.5")
-                                remaining_speed *= 2
-                            stages.append(f"atempo={remaining_speed}")
-                            audio_filters.append(','.join(stages))
-                        else:
-                            audio_filters.append(f'atempo={speed}')
-                else:
-                    cmd.extend(['-c:a', 'copy'])
-
-            # Add filters if any
-            if video_filters:
-                cmd.extend(['-filter:v', ','.join(video_filters)])
-            if audio_filters:
-                cmd.extend(['-filter:a', ','.join(audio_filters)])
-
-            # Add output file
-            cmd.append(output_file)
-            
-            # Use list2cmdline for proper escaping
-            return subprocess.list2cmdline(cmd)
-        else:
-            cmd = ['ffmpeg', '-i', input_file]
-            
-            # Track if we need to combine filters
-            video_filters = []
-            audio_filters = []
-            
-            # Add video parameters
-            if category == "video" and "video" in profile:
-                video = profile["video"]
-                if video.get("codec") != "copy":
-                    cmd.extend(['-c:v', video["codec"]])
-                    if video.get("bitrate") != "copy":
-                        cmd.extend(['-b:v', video["bitrate"]])
-                    if video.get("resolution") != "copy":
-                        cmd.extend(['-s', video["resolution"]])
-                    if video.get("fps") != "copy":
-                        cmd.extend(['-r', video["fps"]])
-                    if video.get("pixel_format") != "copy":
-                        cmd.extend(['-pix_fmt', video["pixel_format"]])
-                    if video.get("preset") != "copy":
-                        cmd.extend(['-preset', video["preset"]])
-                    if video.get("tune") != "copy":
-                        cmd.extend(['-tune', video["tune"]])
-                    if video.get("speed_control", "1x") != "1x":
-                        speed = float(video["speed_control"].replace('x', ''))
-                        video_filters.append(f'setpts={1/speed}*PTS')
-                else:
-                    cmd.extend(['-c:v', 'copy'])
-
-            # Add audio parameters
-            if "audio" in profile:
-                audio = profile["audio"]
-                if audio.get("codec") != "copy":
-                    cmd.extend(['-c:a', audio["codec"]])
+        cmd = ['ffmpeg', '-i', input_file]
+        
+        # Track if we need to combine filters
+        video_filters = []
+        audio_filters = []
+        
+        # Add video parameters
+        if category == "video" and "video" in profile:
+            video = profile["video"]
+            if video.get("codec") != "copy":
+                cmd += ('-c:v', video["codec"])
+                if video.get("bitrate") != "copy":
+                    cmd += ('-b:v', video["bitrate"])
+                if video.get("resolution") != "copy":
+                    cmd += ('-s', video["resolution"])
+                if video.get("fps") != "copy":
+                    cmd += ('-r', video["fps"])
+                if video.get("pixel_format") != "copy":
+                    cmd += ('-pix_fmt', video["pixel_format"])
+                if video.get("preset") != "copy":
+                    cmd += ('-preset', video["preset"])
+                if video.get("tune") != "copy":
+                    cmd += ('-tune', video["tune"])
+                if video.get("speed_control", "1x") != "1x":
+                    video_filters.append(self.setpts_filter(video["speed_control"]))
+            else:
+                cmd += ('-c:v', 'copy')
+
+        # Add audio parameters
+        if "audio" in profile:
+            audio = profile["audio"]
+            if audio.get("codec") != "copy":
+                cmd += ('-c:a', audio["codec"])
                 if audio.get("bitrate") != "copy":
-                    cmd.extend(['-b:a', audio["bitrate"]])
+                    cmd += ('-b:a', audio["bitrate"])
                 if audio.get("sample_rate") != "copy":
-                    cmd.extend(['-ar', audio["sample_rate"]])
+                    cmd += ('-ar', audio["sample_rate"])
                 if audio.get("channels") != "copy":
-                    cmd.extend(['-ac', audio["channels"]])
+                    cmd += ('-ac', audio["channels"])
                 if audio.get("audio_speed", "1x") != "1x":
-                    speed = float(audio["audio_speed"].replace('x', ''))
-                    # For speeds > 2x or < 0.5x, we need to chain multiple atempo filters
-                    if speed > 2:
-                        stages = []
-                        remaining_speed = speed
-                        while remaining_speed > 2:
-                            stages.append("atempo=2.0")
-                            remaining_speed /= 2
-                        stages.append(f"atempo={remaining_speed}")
-                        audio_filters.append(','.join(stages))
-                    elif speed < 0.5:
-                        stages = []
-                        remaining_speed = speed
-                        while remaining_speed < 0.5:
-                            stages.append("atempo=0.5")
-                            remaining_speed *= 2
-                        stages.append(f"atempo={remaining_speed}")
-                        audio_filters.append(','.join(stages))
-                    else:
-                        audio_filters.append(f'atempo={speed}')
-                else:
-                    cmd.extend(['-c:a', 'copy'])
-
-            # Add filters if any
-            if video_filters:
-                cmd.extend(['-filter:v', ','.join(video_filters)])
-            if audio_filters:
-                cmd.extend(['-filter:a', ','.join(audio_filters)])
-
-            # Add output file
-            cmd.append(output_file)
-            
-            return ' '.join(cmd) 
\ No newline at end of file
+                    audio_filters.append(self.atempo_filter(audio["audio_speed"]))
+            else:
+                cmd += ('-c:a', 'copy')
+
+        # Add filters if any
+        if video_filters:
+            cmd += ('-filter:v', ','.join(video_filters))
+        if audio_filters:
+            cmd += ('-filter:a', ','.join(audio_filters))
+
+        # Add output file
+        cmd.append(output_file)
+        
+        return cmd